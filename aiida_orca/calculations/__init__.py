@@ -2,3 +2,4 @@
 """AiiDA-ORCA plugin"""
 from .orca_orca import OrcaCalculation
 from .orca_asa import OrcaAsaCalculation
+from .orca_batch import OrcaBatchCalculation
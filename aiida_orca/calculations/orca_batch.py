@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""AiiDA-ORCA plugin -- Batch Calculations"""
+import os
+import shlex
+
+from aiida.engine import CalcJob
+from aiida.orm import ArrayData, Dict, StructureData, to_aiida_type
+from aiida.common import CalcInfo
+from aiida.common.folders import Folder
+
+from .orca_orca import OrcaCalculation, validate_parser_settings_dict
+
+# Each item is run in its own directory, so that the files ORCA writes next to its input do not clash.
+_DRIVER_SCRIPT = """#!/bin/bash
+# Run ORCA in the directory of each item, at most {max_concurrent} at a time.
+ORCA={executable}
+
+run_item() {{
+    cd "$1" && "$ORCA" {input_file} > {output_file} 2>&1
+}}
+
+for item in {items}; do
+    while [ "$(jobs -rp | wc -l)" -ge {max_concurrent} ]; do
+        wait -n
+    done
+    run_item "$item" &
+done
+wait
+"""
+
+
+def validate_batch_parser_settings(value, _):
+    """Validate the ``parser_settings`` input, which accepts ``max_workers`` on top of the settings of the
+    ``OrcaCalculation``."""
+    if value is None:
+        return None
+    settings = value.get_dict()
+    max_workers = settings.get('max_workers', 1)
+    if not isinstance(max_workers, int) or isinstance(max_workers, bool) or max_workers < 1:
+        return '`parser_settings.max_workers` should be a positive integer'
+    return validate_parser_settings_dict(settings, extra_keys=('max_workers',))
+
+
+def validate_inputs(value, _):
+    """Validate that every structure has parameters, shared or of its own."""
+    structures = value.get('structures', {})
+    if not structures:
+        return 'At least one structure is required in `structures`.'
+    item_parameters = value.get('item_parameters', {})
+    unknown = set(item_parameters) - set(structures)
+    if unknown:
+        return f'`item_parameters` has items without a structure: {", ".join(sorted(unknown))}'
+    if 'parameters' not in value:
+        missing = set(structures) - set(item_parameters)
+        if missing:
+            return f'Neither `parameters` nor `item_parameters` are given for the items: {", ".join(sorted(missing))}'
+    return None
+
+
+class OrcaBatchCalculation(CalcJob):
+    """
+    OrcaBatchCalculation is a subclass of CalcJob to run many small
+    ORCA calculations, one per structure, in a single scheduler job.
+    Each item is written to its own directory, named after its key in
+    the `structures` namespace, and the items are run one after the other
+    or a few at a time by a driver script.
+    """
+
+    # Defaults
+    _INPUT_FILE = OrcaCalculation._INPUT_FILE  # pylint: disable=protected-access
+    _OUTPUT_FILE = OrcaCalculation._OUTPUT_FILE  # pylint: disable=protected-access
+    _HESSIAN_FILE = OrcaCalculation._HESSIAN_FILE  # pylint: disable=protected-access
+    _INPUT_COORDS_FILE = OrcaCalculation._INPUT_COORDS_FILE  # pylint: disable=protected-access
+    _RELAX_COORDS_FILE = OrcaCalculation._RELAX_COORDS_FILE  # pylint: disable=protected-access
+    _DRIVER_FILE = 'aiida.batch.sh'
+    _PARSER = 'orca_batch_parser'
+    _ARRAY_THRESHOLD = OrcaCalculation._ARRAY_THRESHOLD  # pylint: disable=protected-access
+
+    @classmethod
+    def define(cls, spec):
+        super(OrcaBatchCalculation, cls).define(spec)
+
+        # Input parameters
+        spec.input_namespace(
+            'structures',
+            valid_type=StructureData,
+            dynamic=True,
+            help='Input structures, by the name of their item, which is also the name of its directory'
+        )
+        spec.input(
+            'parameters',
+            valid_type=Dict,
+            serializer=to_aiida_type,
+            required=False,
+            help='Input parameters shared by the items without parameters in `item_parameters`.'
+        )
+        spec.input_namespace(
+            'item_parameters',
+            valid_type=Dict,
+            required=False,
+            dynamic=True,
+            help='Input parameters of single items, used in place of the shared `parameters`.'
+        )
+        spec.input(
+            'parser_settings',
+            valid_type=Dict,
+            serializer=to_aiida_type,
+            required=False,
+            validator=validate_batch_parser_settings,
+            help='Settings for the parser, as for the `OrcaCalculation`. `max_workers` is the number of processes '
+            'that parse the outputs of the items in parallel, by default 1.'
+        )
+        spec.inputs.validator = validate_inputs
+
+        # Specify default parser
+        spec.input('metadata.options.parser_name', valid_type=str, default=cls._PARSER, non_db=True)
+
+        # Specify how many items are run at the same time
+        spec.input('metadata.options.max_concurrent', valid_type=int, default=1)
+
+        spec.input('metadata.options.withmpi', valid_type=bool, default=False)
+
+        # Exit codes, those of the items are the same as for the `OrcaCalculation`
+        for label, exit_code in OrcaCalculation.spec().exit_codes.items():
+            if label not in spec.exit_codes:
+                spec.exit_code(exit_code.status, label, message=exit_code.message)
+        spec.exit_code(
+            350,
+            'ERROR_ITEMS_UNSUCCESSFUL',
+            message='The calculations of some items were unsuccessful: {items}. The exit status of each item is in '
+            'its output parameters.'
+        )
+
+        # Output parameters
+        spec.output_namespace(
+            'output_parameters',
+            valid_type=Dict,
+            dynamic=True,
+            help='the results of the calculation of each item, with its `exit_status` and `exit_message`'
+        )
+        spec.output_namespace(
+            'relaxed_structures',
+            valid_type=StructureData,
+            required=False,
+            dynamic=True,
+            help='relaxed structure of each item'
+        )
+        spec.output_namespace(
+            'output_arrays',
+            valid_type=ArrayData,
+            required=False,
+            dynamic=True,
+            help='the large array attributes of each item, see the `output_arrays` of the `OrcaCalculation`'
+        )
+
+    def prepare_for_submission(self, folder: Folder) -> CalcInfo:
+        """Create the input directories of the items and the script that runs them.
+
+        Args:
+            folder (Folder): ``AiiDA`` folder to temporarily write files on disk
+
+        Returns:
+            CalcInfo: ``AiiDA`` CalcInfo Instance
+        """
+        # pylint: disable=protected-access
+        parameters = self.inputs.get('parameters')
+        item_parameters = self.inputs.get('item_parameters', {})
+        items = sorted(self.inputs.structures)
+
+        calcinfo = CalcInfo()
+        calcinfo.retrieve_list = []
+        for item in items:
+            subfolder = folder.get_subfolder(item, create=True)
+            OrcaCalculation._write_structure(self.inputs.structures[item], subfolder, self._INPUT_COORDS_FILE)
+            OrcaCalculation._write_input_file(item_parameters.get(item, parameters), subfolder, self._INPUT_FILE)
+            # The files are retrieved in the directory of their item.
+            for filename in (self._OUTPUT_FILE, self._HESSIAN_FILE, self._RELAX_COORDS_FILE):
+                calcinfo.retrieve_list.append((os.path.join(item, filename), '.', 2))
+
+        # Change this when we drop AiiDA 1.x support
+        # executable = str(self.inputs.code.get_executable())
+        code = self.inputs.code
+        executable = str(code.get_executable()) if hasattr(code, 'get_executable') else code.get_remote_exec_path()
+        with folder.open(self._DRIVER_FILE, 'w', encoding='utf-8') as handle:
+            handle.write(
+                _DRIVER_SCRIPT.format(
+                    executable=shlex.quote(executable),
+                    input_file=shlex.quote(self._INPUT_FILE),
+                    output_file=shlex.quote(self._OUTPUT_FILE),
+                    items=' '.join(shlex.quote(item) for item in items),
+                    max_concurrent=max(self.inputs.metadata.options.max_concurrent, 1),
+                )
+            )
+
+        # The driver runs ORCA itself, from the directory of each item, which a `CodeInfo` cannot do.
+        calcinfo.codes_info = []
+        calcinfo.append_text = f'bash {self._DRIVER_FILE}'
+        return calcinfo
@@ -1,14 +1,66 @@
 # -*- coding: utf-8 -*-
 """AiiDA-ORCA plugin -- Main Calculations"""
+import os
 
 from aiida.engine import CalcJob
-from aiida.orm import Dict, SinglefileData, StructureData, to_aiida_type
+from aiida.orm import ArrayData, Dict, RemoteData, SinglefileData, StructureData, to_aiida_type
 from aiida.common import CalcInfo, CodeInfo
 from aiida.common.folders import Folder
 
+from aiida_orca.parsers.compressed import COMMANDS, EXTENSIONS
 from aiida_orca.utils import render_orca_input
 
 
+def validate_parser_settings(value, _):
+    """Validate the ``parser_settings`` input."""
+    if value is None:
+        return None
+    return validate_parser_settings_dict(value.get_dict())
+
+
+def validate_parser_settings_dict(settings, extra_keys=()):
+    """Validate the dictionary of the ``parser_settings`` input, which may have extra keys validated by the caller."""
+    unknown = set(settings) - {
+        'attributes', 'profile', 'array_threshold', 'probe_tail', 'offload_threshold', *extra_keys
+    }
+    if unknown:
+        return f'Unknown keys in `parser_settings`: {", ".join(sorted(unknown))}'
+    attributes = settings.get('attributes')
+    if attributes is not None:
+        if not isinstance(attributes, list):
+            return '`parser_settings.attributes` should be a list of cclib attribute names'
+        # cclib is only imported when it is needed, see `aiida_orca.parsers`.
+        from aiida_orca.parsers.cclib.data import ccData
+        unknown = set(attributes) - set(ccData._attrlist)  # pylint: disable=protected-access
+        if unknown:
+            return f'Unknown cclib attributes in `parser_settings.attributes`: {", ".join(sorted(unknown))}'
+    for key in ('profile', 'probe_tail'):
+        if not isinstance(settings.get(key, False), bool):
+            return f'`parser_settings.{key}` should be a boolean'
+    for key in ('array_threshold', 'offload_threshold'):
+        threshold = settings.get(key, 0)
+        if not isinstance(threshold, int) or isinstance(threshold, bool) or threshold < 0:
+            return f'`parser_settings.{key}` should be a non-negative integer'
+    return None
+
+
+def validate_compress_output(value, _):
+    """Validate the ``compress_output`` option."""
+    if value is not None and value not in COMMANDS:
+        return f'`compress_output` should be one of {", ".join(COMMANDS)}'
+    return None
+
+
+def validate_temporary_files(value, _):
+    """Validate the ``temporary_files`` option."""
+    # pylint: disable=protected-access
+    allowed = (OrcaCalculation._OUTPUT_FILE, OrcaCalculation._HESSIAN_FILE, OrcaCalculation._RELAX_COORDS_FILE)
+    if value is not None:
+        if not isinstance(value, (list, tuple)) or set(value) - set(allowed):
+            return f'`temporary_files` should be a list of {", ".join(allowed)}'
+    return None
+
+
 class OrcaCalculation(CalcJob):
     """
     This is a OrcaCalculation, subclass of JobCalculation,
@@ -26,7 +78,10 @@ class OrcaCalculation(CalcJob):
     _TRAJECTORY_FILE = 'aiida_trj.xyz'
     _PARSER = 'orca_base_parser'
     _GBW_FILE = 'aiida.gbw'
+    _OLD_GBW_FILE = 'aiida_old.gbw'
+    _OLD_HESSIAN_FILE = 'aiida_old.hess'
     _PARENT_CALC_FOLDER = 'parent_calc'
+    _ARRAY_THRESHOLD = 1000
 
     @classmethod
     def define(cls, spec):
@@ -48,6 +103,30 @@ class OrcaCalculation(CalcJob):
             help='Additional input files like gbw or hessian',
             dynamic=True
         )
+        spec.input(
+            'parent_calc_folder',
+            valid_type=RemoteData,
+            required=False,
+            help='Working directory of a previous calculation, whose gbw and hessian files are made available as '
+            f'`{cls._OLD_GBW_FILE}` and `{cls._OLD_HESSIAN_FILE}`, unless files of the `file` namespace take their '
+            'place. They are symlinked, or copied if the `parent_folder_symlink` option is False.'
+        )
+        spec.input(
+            'parser_settings',
+            valid_type=Dict,
+            serializer=to_aiida_type,
+            required=False,
+            validator=validate_parser_settings,
+            help='Settings for the parser. `attributes` lists the cclib attributes to parse, e.g. only scfenergies, '
+            'atomcoords and vibfreqs, so that expensive sections like the molecular orbitals or the overlap matrix '
+            'are skipped when none of their attributes is requested. `profile` records the time, lines and bytes '
+            'spent in each section of the output, reported in the metadata and in the parser log. '
+            f'`array_threshold` is the number of elements (by default {cls._ARRAY_THRESHOLD}) above which array '
+            'attributes are stored in `output_arrays` instead of `output_parameters`, as are arrays with NaN or '
+            'infinite values. Unless `probe_tail` is False, outputs ending with a fatal ORCA error are not parsed '
+            'beyond that error. Outputs larger than `offload_threshold` bytes as retrieved, if given, are parsed in a '
+            'separate process, so that the daemon worker is not held up for the whole parse.'
+        )
 
         # Specify default parser
         spec.input('metadata.options.parser_name', valid_type=str, default=cls._PARSER, non_db=True)
@@ -58,6 +137,38 @@ class OrcaCalculation(CalcJob):
         # Specify default output file
         spec.input('metadata.options.output_filename', valid_type=str, default=cls._OUTPUT_FILE)
 
+        # Specify whether the output is compressed on the remote before it is retrieved
+        spec.input(
+            'metadata.options.compress_output',
+            valid_type=str,
+            required=False,
+            validator=validate_compress_output,
+            help='Compression of the output on the remote computer before it is retrieved, one of '
+            f'{", ".join(COMMANDS)}, with which it stays compressed in the repository. The parser decompresses it as '
+            'it reads it. The command of the compression must be available on the remote computer.'
+        )
+
+        # Specify which of the retrieved files are only kept for the parser
+        spec.input(
+            'metadata.options.temporary_files',
+            valid_type=list,
+            required=False,
+            validator=validate_temporary_files,
+            help=f'Files, of {cls._OUTPUT_FILE}, {cls._HESSIAN_FILE} and {cls._RELAX_COORDS_FILE}, that are retrieved '
+            'to a temporary folder for the parser and deleted after it, rather than stored in the repository. The '
+            'outputs parsed from them are stored as usual.'
+        )
+        spec.input(
+            'metadata.options.output_digest',
+            valid_type=bool,
+            default=False,
+            help=f'Whether to store a digest of {cls._OUTPUT_FILE}, with its header, warnings, final energies and last '
+            'lines, as the `output_digest` output when it is one of the `temporary_files`.'
+        )
+
+        # Specify whether the files of the parent calculation are symlinked rather than copied
+        spec.input('metadata.options.parent_folder_symlink', valid_type=bool, default=True)
+
         spec.input('metadata.options.withmpi', valid_type=bool, default=False)
 
         # Exit codes
@@ -70,10 +181,41 @@ class OrcaCalculation(CalcJob):
             303, 'ERROR_CALCULATION_UNSUCCESSFUL', message='The ORCA calculation did not finish succesfully.'
         )
         spec.exit_code(311, 'ERROR_OUTPUT_STDOUT_PARSE', message='The stdout output file could not be parsed.')
+        spec.exit_code(312, 'ERROR_INPUT', message='ORCA could not understand the input file.')
+        spec.exit_code(
+            313, 'ERROR_BASIS_SET_MISSING', message='The basis set is not available for an element of the structure.'
+        )
+        spec.exit_code(
+            400,
+            'ERROR_OUT_OF_WALLTIME',
+            message='The calculation was killed by the scheduler when it ran out of walltime.'
+        )
+        spec.exit_code(410, 'ERROR_SCF_NOT_CONVERGED', message='ORCA stopped because the SCF did not converge.')
+        spec.exit_code(
+            420, 'ERROR_INSUFFICIENT_MEMORY', message='ORCA ran out of memory, the MaxCore setting may be too small.'
+        )
+        spec.exit_code(
+            500,
+            'ERROR_OPTIMIZATION_NOT_CONVERGED',
+            message='The geometry optimization reached the maximum number of cycles without converging.'
+        )
 
         # Output parameters
         spec.output('output_parameters', valid_type=Dict, required=True, help='the results of the calculation')
         spec.output('relaxed_structure', valid_type=StructureData, required=False, help='relaxed structure')
+        spec.output(
+            'output_arrays',
+            valid_type=ArrayData,
+            required=False,
+            help='the large array attributes, e.g. mocoeffs, aooverlaps or vibdisps, and those with NaN or infinite '
+            'values, referenced by name under the `arrays` key of the output parameters'
+        )
+        spec.output(
+            'output_digest',
+            valid_type=SinglefileData,
+            required=False,
+            help='digest of the output, when it is not stored in the repository, see the `output_digest` option'
+        )
         spec.default_output_node = 'output_parameters'
 
     def prepare_for_submission(self, folder: Folder) -> CalcInfo:
@@ -111,15 +253,46 @@ class OrcaCalculation(CalcJob):
             calcinfo.local_copy_list = []
             for name, obj in self.inputs.file.items():
                 if name == 'gbw':
-                    calcinfo.local_copy_list.append((obj.uuid, obj.filename, 'aiida_old.gbw'))
+                    calcinfo.local_copy_list.append((obj.uuid, obj.filename, self._OLD_GBW_FILE))
                 else:
                     calcinfo.local_copy_list.append((obj.uuid, obj.filename, obj.filename))
 
+        # files of a previous calculation, that stay on the remote computer
+        if 'parent_calc_folder' in self.inputs:
+            parent_calc_folder = self.inputs.parent_calc_folder
+            local_targets = [target for _, _, target in calcinfo.local_copy_list or []]
+            remote_list = []
+            for source, target in ((self._GBW_FILE, self._OLD_GBW_FILE), (self._HESSIAN_FILE, self._OLD_HESSIAN_FILE)):
+                if target not in local_targets:
+                    source = os.path.join(parent_calc_folder.get_remote_path(), source)
+                    remote_list.append((parent_calc_folder.computer.uuid, source, target))
+            if self.inputs.metadata.options.parent_folder_symlink:
+                calcinfo.remote_symlink_list = remote_list
+            else:
+                calcinfo.remote_copy_list = remote_list
+
         # Retrieve list
         calcinfo.retrieve_list = [self._OUTPUT_FILE, self._HESSIAN_FILE, self._RELAX_COORDS_FILE]
+
+        # The output is compressed after ORCA ends, which a job killed at the walltime does not reach, in which case
+        # the output is retrieved uncompressed.
+        compression = self.inputs.metadata.options.get('compress_output')
+        if compression is not None:
+            calcinfo.append_text = f'{COMMANDS[compression]} {self._OUTPUT_FILE}'
+            calcinfo.retrieve_list.append(self._OUTPUT_FILE + EXTENSIONS[compression])
+
+        # Files that are only needed by the parser, with their compressed variants, are retrieved temporarily
+        temporary_files = self.inputs.metadata.options.get('temporary_files') or []
+        if temporary_files:
+            temporary = [
+                name for name in calcinfo.retrieve_list if any(name.startswith(fname) for fname in temporary_files)
+            ]
+            calcinfo.retrieve_list = [name for name in calcinfo.retrieve_list if name not in temporary]
+            calcinfo.retrieve_temporary_list = temporary
         return calcinfo
 
-    def _write_input_file(self, parameters: Dict, folder: Folder, filename: str) -> None:
+    @classmethod
+    def _write_input_file(cls, parameters: Dict, folder: Folder, filename: str) -> None:
         """Function that writes ORCA input file"""
         params = parameters.get_dict()
 
@@ -135,14 +308,24 @@ class OrcaCalculation(CalcJob):
         with open(folder.get_abs_path(filename), mode='w', encoding='utf-8') as fobj:
             fobj.write(input_file_string)
             # coordinate section
-            fobj.write(f'\n* xyzfile {charge} {mult} {self._INPUT_COORDS_FILE}\n')
+            fobj.write(f'\n* xyzfile {charge} {mult} {cls._INPUT_COORDS_FILE}\n')
 
     @staticmethod
     def _write_structure(structure: StructureData, folder: Folder, filename: str) -> None:
-        """Function that writes a structure to a file in an XYZ format"""
+        """Function that writes a structure to a file in the plain XYZ format
 
-        # create file with the XYZ structure
-        ase_struct = structure.get_ase()
-        # ORCA cannot read the extended XYZ format, hence plain=True is needed.
-        # https://wiki.fysik.dtu.dk/ase/ase/io/formatoptions.html#ase.io.extxyz.write_extxyz
-        ase_struct.write(folder.get_abs_path(filename), format='extxyz', plain=True)
+        ORCA cannot read the extended XYZ format, so the file is formatted as ASE's `extxyz` writer does with
+        `plain=True`, without going through ASE.
+        https://wiki.fysik.dtu.dk/ase/ase/io/formatoptions.html#ase.io.extxyz.write_extxyz
+        """
+        kinds = {kind.name: kind for kind in structure.kinds}
+        lines = [f'{len(structure.sites)}', '']
+        for site in structure.sites:
+            kind = kinds[site.kind_name]
+            if kind.is_alloy or kind.has_vacancies:
+                raise ValueError(f'The kind {kind.name} is an alloy or has vacancies, which ORCA cannot handle')
+            x, y, z = site.position  # pylint: disable=invalid-name
+            lines.append(f'{kind.symbol:<2} {x:16.8f} {y:16.8f} {z:16.8f}')
+
+        with open(folder.get_abs_path(filename), mode='w', encoding='utf-8') as fobj:
+            fobj.write('\n'.join(lines) + '\n')
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Command line interface of the AiiDA-ORCA plugin, which works without an AiiDA profile."""
+import os
+
+import click
+
+
+@click.group('aiida-orca')
+def cmd_root():
+    """Command line interface of the AiiDA-ORCA plugin."""
+
+
+@cmd_root.command('parse')
+@click.argument('paths', nargs=-1, required=True)
+@click.option(
+    '-o',
+    '--output',
+    required=True,
+    type=click.Path(file_okay=False, writable=True),
+    help='Directory to which the Parquet tables are written.'
+)
+@click.option(
+    '-p', '--pattern', default='*.out', show_default=True, help='Glob pattern of the outputs in the directories.'
+)
+@click.option(
+    '-n',
+    '--workers',
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help='Number of processes that parse the outputs.'
+)
+@click.option(
+    '-a',
+    '--attribute',
+    'attributes',
+    multiple=True,
+    help='cclib attribute to parse, e.g. scfenergies, which can be repeated. By default all attributes are parsed.'
+)
+def cmd_parse(paths, output, pattern, workers, attributes):
+    """Parse the ORCA outputs in PATHS with cclib and write their attributes to Parquet tables.
+
+    PATHS are outputs, directories searched recursively for outputs or glob patterns of either. The attributes with a
+    single value are written to OUTPUT/jobs.parquet, with one row per output, and the arrays to a table per attribute,
+    OUTPUT/arrays/<attribute>.parquet, with one row per array.
+    """
+    try:
+        import pyarrow  # pylint: disable=unused-import
+    except ImportError:
+        raise click.ClickException('Writing Parquet tables requires pyarrow: pip install aiida-orca[export]')
+
+    from aiida_orca.parsers.export import ParquetExporter, find_outputs, parse_paths
+
+    parser_settings = {}
+    if attributes:
+        from aiida_orca.parsers.cclib.data import ccData
+        unknown = set(attributes) - set(ccData._attrlist)  # pylint: disable=protected-access
+        if unknown:
+            raise click.BadParameter(
+                f'unknown cclib attributes: {", ".join(sorted(unknown))}', param_hint='--attribute'
+            )
+        parser_settings['attributes'] = list(attributes)
+
+    outputs = find_outputs(paths, pattern)
+    if not outputs:
+        raise click.ClickException(f'No outputs matching {pattern} were found.')
+
+    failed = 0
+    with ParquetExporter(output) as exporter:
+        results = parse_paths(outputs, parser_settings, min(workers, len(outputs)))
+        with click.progressbar(
+            results, length=len(outputs), label='Parsing', file=click.get_text_stream('stderr')
+        ) as bar:
+            for path, parsed, error in bar:
+                exporter.add(path, parsed, error)
+                if error is not None:
+                    failed += 1
+
+    click.echo(f'Parsed {len(outputs) - failed} of {len(outputs)} outputs to {output}')
+    if failed:
+        click.echo(f'{failed} outputs could not be parsed, see the parse_error column of jobs.parquet', err=True)
+
+
+@cmd_root.command('import')
+@click.argument('paths', nargs=-1, required=True)
+@click.option('--profile', help='AiiDA profile to import the calculations into, by default the default profile.')
+@click.option('-c', '--code', help='Label, pk or UUID of the code that ran the calculations, if it is known.')
+@click.option('-g', '--group', help='Label of a group to which the calculations are added, created if needed.')
+@click.option(
+    '-p', '--pattern', default='*.out', show_default=True, help='Glob pattern of the outputs in the directories.'
+)
+@click.option(
+    '-n',
+    '--workers',
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help='Number of processes that parse the outputs.'
+)
+@click.option(
+    '-b',
+    '--batch-size',
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help='Number of calculations stored in one transaction.'
+)
+def cmd_import(paths, profile, code, group, pattern, workers, batch_size):
+    """Import the ORCA outputs in PATHS, run outside of AiiDA, as OrcaCalculation nodes.
+
+    PATHS are outputs, directories searched recursively for outputs or glob patterns of either. The structure and
+    parameters of each calculation are reconstructed from its output, whose relaxed structure and Hessian, if they are
+    next to it with the same name, are imported too.
+    """
+    from aiida import load_profile, orm
+    from aiida.manage.configuration import get_profile
+
+    from aiida_orca.parsers.export import find_outputs
+    from aiida_orca.utils.importer import import_outputs
+
+    if profile is not None or get_profile() is None:
+        load_profile(profile)
+
+    outputs = find_outputs(paths, pattern)
+    if not outputs:
+        raise click.ClickException(f'No outputs matching {pattern} were found.')
+
+    if code is not None:
+        code = orm.load_code(code)
+    if group is not None:
+        # Change this when we drop AiiDA 1.x support
+        # group, _ = orm.Group.collection.get_or_create(group)
+        collection = orm.Group.collection if hasattr(orm.Group, 'collection') else orm.Group.objects
+        group, _ = collection.get_or_create(group)
+
+    imported, failed = import_outputs(outputs, code, group, min(workers, len(outputs)), batch_size)
+
+    click.echo(f'Imported {len(imported)} of {len(outputs)} outputs')
+    for filepath, error in failed:
+        click.echo(f'Could not import {filepath}: {error}', err=True)
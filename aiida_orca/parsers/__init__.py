@@ -1,23 +1,66 @@
 # -*- coding: utf-8 -*-
 """AiiDA-ORCA output parser"""
+import io
+import os
 import pathlib
+import tempfile
 import traceback
-
-import ase.io
-import numpy as np
+import typing as t
 
 from aiida.parsers import Parser
 from aiida.common import OutputParsingError, NotExistent
 from aiida.engine import ExitCode
-from aiida.orm import Dict, StructureData
+from aiida.orm import ArrayData, Dict, SinglefileData, StructureData
+
+from .cache import cache_key, get_cache
+from .compressed import EXTENSIONS, detect_compression, open_compressed
+from .digest import write_digest
+from .pool import copy_to_directory, get_executor
+from .tail import classify_error, killed_by_walltime, probe_tail, read_stream_tail, read_tail
+
+# ASE, numpy and cclib are imported when an output is parsed, so that loading the entry points of the plugin,
+# which every daemon worker and `verdi` invocation does, does not import them.
+
+
+def _is_finite(array: 'numpy.ndarray') -> bool:
+    """Return whether all values of a numerical array are finite.
+
+    The sum of the array is only finite if all of its values are, which is checked without a temporary array
+    of the size of the input. A sum overflowing to infinity only means the array is treated as non-finite.
+    """
+    import numpy as np
+    if array.dtype.kind not in 'fc':
+        return True
+    with np.errstate(over='ignore', invalid='ignore'):
+        return bool(np.isfinite(array.sum()))
+
+
+def read_output(source: t.Union[str, t.TextIO], parser_settings: dict) -> dict:
+    """Parse an ORCA output with cclib.
+
+    Args:
+        source (str or TextIO): Path of the output, or the output opened in text mode
+        parser_settings (dict): Settings of the parser, of which ``attributes`` and ``profile`` are used
+
+    Returns:
+        dict: The parsed attributes
+    """
+    from .cclib.ccio import ccread
 
-from .cclib.utils import PeriodicTable
-from .cclib.ccio import ccread
+    parsed_obj = ccread(
+        source,
+        attributes=parser_settings.get('attributes'),
+        profile=parser_settings.get('profile', False),
+    )
+    return parsed_obj.getattributes()
 
 
 class OrcaBaseParser(Parser):
     """Basic AiiDA parser for the output of Orca"""
 
+    #: Path of the folder with the files retrieved only for the parser, see the ``temporary_files`` option.
+    _temporary_folder: t.Optional[str] = None
+
     def parse(self, **kwargs):
         """
         It uses cclib to get the output dictionary.
@@ -30,46 +73,250 @@ class OrcaBaseParser(Parser):
         process_cls = self.node.process_class
         fname_out = process_cls._OUTPUT_FILE  # pylint: disable=protected-access
         fname_relaxed = process_cls._RELAX_COORDS_FILE  # pylint: disable=protected-access
+        self._temporary_folder = kwargs.get('retrieved_temporary_folder')
 
-        if fname_out not in self.retrieved.list_object_names():
+        fname_out = self._find_output(fname_out)
+        if fname_out is None:
             return process_cls.exit_codes.ERROR_OUTPUT_STDOUT_MISSING
 
-        try:
-            # Change this when we drop AiiDA 1.x support
-            # with self.retrieved.base.repository.open(fname_out) as handle:
-            with self.retrieved.open(fname_out) as handle:
-                parsed_obj = ccread(handle)
-                parsed_dict = parsed_obj.getattributes()
-        except Exception:  # pylint: disable=broad-except
-            self.logger.error(f'ERROR: cclib could not parse file {fname_out}')
-            self.logger.error(f'{traceback.format_exc()}')
-            return self.exit_codes.ERROR_OUTPUT_STDOUT_PARSE
+        outputs, exit_code = self._parse_retrieved(fname_out, fname_relaxed)
+        if self.node.get_option('output_digest') and self._is_temporary(fname_out):
+            outputs['output_digest'] = self._get_output_digest(fname_out)
+        for link_label, node in outputs.items():
+            self.out(link_label, node)
+        return exit_code
+
+    def _parse_retrieved(self,
+                         fname_out: str,
+                         fname_relaxed: str,
+                         parsed_dict: t.Optional[dict] = None) -> t.Tuple[dict, ExitCode]:
+        """Create the output nodes of a retrieved output.
+
+        Args:
+            fname_out (str): Name of the retrieved output
+            fname_relaxed (str): Name of the retrieved file with the relaxed structure
+            parsed_dict (dict): Attributes already parsed from the output, e.g. by the bulk importer, which are used
+                instead of parsing the output again
+
+        Returns:
+            tuple: The output nodes, by link label, and the exit code of the calculation
+        """
+        parser_settings = self._get_parser_settings()
+        tail = self._read_output_tail(fname_out)
+        result = self._check_fatal_error(tail, parser_settings)
+        if result is not None:
+            return result
+
+        if parsed_dict is None:
+            try:
+                parsed_dict = self._read_output(fname_out, parser_settings)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.error(f'ERROR: cclib could not parse file {fname_out}')
+                self.logger.error(f'{traceback.format_exc()}')
+                return {}, self.exit_codes.ERROR_OUTPUT_STDOUT_PARSE
+        return self._process_output(parsed_dict, tail, parser_settings, fname_relaxed)
+
+    def _get_parser_settings(self) -> dict:
+        """Return the ``parser_settings`` input of the calculation, or an empty dictionary if it has none."""
+        if 'parser_settings' in self.node.inputs:
+            return self.node.inputs.parser_settings.get_dict()
+        return {}
+
+    def _is_temporary(self, fname: str) -> bool:
+        """Return whether a file was retrieved to the temporary folder, rather than to the repository."""
+        return self._temporary_folder is not None and os.path.isfile(os.path.join(self._temporary_folder, fname))
+
+    def _list_object_names(self) -> t.List[str]:
+        """Return the names of the files retrieved to the repository and to the temporary folder."""
+        names = self.retrieved.list_object_names()
+        if self._temporary_folder is not None:
+            names += [name for name in os.listdir(self._temporary_folder) if self._is_temporary(name)]
+        return names
+
+    def _open(self, fname: str, mode: str = 'r') -> t.IO:
+        """Open a retrieved file, from the temporary folder if it was retrieved there.
+
+        Args:
+            fname (str): Name of the file
+            mode (str): ``r``, in which undecodable bytes of files in the temporary folder are ignored, or ``rb``
+
+        Returns:
+            IO: The opened file
+        """
+        if self._is_temporary(fname):
+            path = os.path.join(self._temporary_folder, fname)
+            if 'b' in mode:
+                return open(path, mode)  # pylint: disable=consider-using-with
+            return open(path, mode, encoding='utf-8', errors='ignore')  # pylint: disable=consider-using-with
+        # Change this when we drop AiiDA 1.x support
+        # return self.retrieved.base.repository.open(fname, mode)
+        return self.retrieved.open(fname, mode)
+
+    def _get_output_digest(self, fname_out: str) -> SinglefileData:
+        """Return the digest of an output that is not kept in the repository, see ``write_digest``."""
+        with self._open(fname_out, 'rb') as handle:
+            compression = detect_compression(handle)
+            if compression is None:
+                stream = io.TextIOWrapper(handle, encoding='utf-8', errors='ignore')
+            else:
+                stream = open_compressed(handle, compression)
+            digest = io.BytesIO(write_digest(stream).encode('utf-8'))
+        filename = f'{self.node.process_class._OUTPUT_FILE}.digest'  # pylint: disable=protected-access
+        return SinglefileData(file=digest, filename=filename)
+
+    def _find_output(self, fname_out: str) -> t.Optional[str]:
+        """Return the name of the retrieved output, which is compressed if the ``compress_output`` option was set,
+        unless the job was killed before it could be compressed, or ``None`` if it was not retrieved."""
+        names = self._list_object_names()
+        for name in (fname_out, *(fname_out + extension for extension in EXTENSIONS.values())):
+            if name in names:
+                return name
+        return None
+
+    def _read_output_tail(self, fname_out: str) -> str:
+        """Read the end of a retrieved output, see ``read_tail``, decompressing the whole output if it is compressed."""
+        with self._open(fname_out, 'rb') as handle:
+            compression = detect_compression(handle)
+            if compression is None:
+                return read_tail(handle)
+            with open_compressed(handle, compression, 'rb') as stream:
+                return read_stream_tail(stream)
+
+    def _read_output(self, fname_out: str, parser_settings: dict) -> dict:
+        """Return the attributes of a retrieved output from the parse cache, if it is enabled and has them, or parse
+        the output and add its attributes to the cache, see ``aiida_orca.parsers.cache``.
+
+        Args:
+            fname_out (str): Name of the retrieved output
+            parser_settings (dict): Settings of the parser
+
+        Returns:
+            dict: The parsed attributes, see ``read_output``
+        """
+        key, parsed_dict = self._get_cached(fname_out, parser_settings)
+        if parsed_dict is not None:
+            return parsed_dict
+
+        parsed_dict = self._parse_output(fname_out, parser_settings)
+        self._put_cached(key, parsed_dict)
+        return parsed_dict
+
+    def _get_cached(self, fname_out: str, parser_settings: dict) -> t.Tuple[t.Optional[str], t.Optional[dict]]:
+        """Return the key of a retrieved output in the parse cache and its cached attributes.
+
+        Returns:
+            tuple: The key, or ``None`` if the cache is disabled or the output is not cached, see ``cache_key``, and
+            the attributes, or ``None`` if the cache has no entry for the key
+        """
+        cache = get_cache()
+        key = self._cache_key(fname_out, parser_settings) if cache is not None else None
+        if key is None:
+            return None, None
+        parsed_dict = cache.get(key)
+        if parsed_dict is not None:
+            self.logger.info(f'Using the cached attributes of {fname_out}')
+        return key, parsed_dict
+
+    @staticmethod
+    def _put_cached(key: t.Optional[str], parsed_dict: dict) -> None:
+        """Add the attributes of an output to the parse cache under a key returned by ``_get_cached``, if it is one."""
+        if key is not None:
+            get_cache().put(key, parsed_dict)
+
+    def _cache_key(self, fname_out: str, parser_settings: dict) -> t.Optional[str]:
+        """Return the key of a retrieved output in the parse cache, see ``cache_key``."""
+        with self._open(fname_out, 'rb') as handle:
+            return cache_key(handle, parser_settings)
+
+    def _parse_output(self, fname_out: str, parser_settings: dict) -> dict:
+        """Parse a retrieved output with cclib, in a separate process if it is larger than ``offload_threshold``.
+
+        Args:
+            fname_out (str): Name of the retrieved output
+            parser_settings (dict): Settings of the parser
+
+        Returns:
+            dict: The parsed attributes, see ``read_output``
+        """
+        threshold = parser_settings.get('offload_threshold')
+        if threshold is not None:
+            with self._open(fname_out, 'rb') as handle:
+                size = handle.seek(0, io.SEEK_END)
+            if size > threshold:
+                self.logger.info(f'Parsing {fname_out} of {size} bytes in a separate process')
+                with tempfile.TemporaryDirectory() as dirpath:
+                    if self._is_temporary(fname_out):
+                        filepath = os.path.join(self._temporary_folder, fname_out)
+                    else:
+                        filepath = copy_to_directory(self.retrieved, fname_out, dirpath, 'aiida.out')
+                    return get_executor().submit(read_output, filepath, parser_settings).result()
+
+        with self._open(fname_out) as handle:
+            return read_output(handle, parser_settings)
+
+    def _check_fatal_error(self, tail: str, parser_settings: dict) -> t.Optional[t.Tuple[dict, ExitCode]]:
+        """Check the end of an output for a fatal ORCA error, in which case the output is not parsed any further.
+
+        Args:
+            tail (str): End of the output
+            parser_settings (dict): Settings of the parser
+
+        Returns:
+            tuple: The output nodes, whose parameters only hold the error message, and the exit code of the error, or
+            ``None`` if the output has no fatal error or ``probe_tail`` is disabled
+        """
+        if not parser_settings.get('probe_tail', True):
+            return None
+        _, error_message = probe_tail(tail)
+        if error_message is None:
+            return None
+        self.logger.error(f'ORCA terminated with a fatal error: {error_message}')
+        output_dict = {'metadata': {'success': False}, 'error_message': error_message}
+        return {'output_parameters': Dict(dict=output_dict)}, self._unsuccessful_exit_code(tail)
+
+    def _process_output(self, parsed_dict: dict, tail: str, parser_settings: dict,
+                        fname_relaxed: str) -> t.Tuple[dict, ExitCode]:
+        """Create the output nodes of a parsed output.
+
+        Args:
+            parsed_dict (dict): Attributes parsed by cclib, see ``read_output``
+            tail (str): End of the output
+            parser_settings (dict): Settings of the parser
+            fname_relaxed (str): Name of the retrieved file with the relaxed structure
+
+        Returns:
+            tuple: The output nodes, by link label, and the exit code of the calculation
+        """
+        import ase.io
+        import numpy as np
+
+        from .cclib.utils import PeriodicTable
+
+        array_threshold = self.node.process_class._ARRAY_THRESHOLD  # pylint: disable=protected-access
+        outputs = {}
 
         def _remove_nan(parsed_dictionary: dict) -> dict:
-            """cclib parsed object may contain nan values in ndarray.
-            It will results in an exception in aiida-core which comes from
-            json serialization and thereofore dictionary cannot be stored.
-            This removes nan values to remedy this issue.
+            """cclib parsed object may contain nan values.
+            They result in an exception in aiida-core which comes from
+            json serialization and therefore dictionary cannot be stored.
             See:
             https://github.com/aiidateam/aiida-core/issues/2412
             https://github.com/aiidateam/aiida-core/issues/3450
 
+            Arrays with non-finite values are kept as they are, since they
+            are stored in the `output_arrays` instead, see `_split_arrays`.
+
             Args:
                 parsed_dictionary (dict): Parsed dictionary from `cclib`
 
             Returns:
-                dict: Parsed dictionary without `NaN`
+                dict: Parsed dictionary without `NaN` outside of arrays
             """
 
-            for key, value in parsed_dictionary.items():
-                if isinstance(value, np.ndarray):
-                    non_nan_value = np.nan_to_num(value, nan=123456789, posinf=2e308, neginf=-2e308)
-                    parsed_dictionary.update({key: non_nan_value})
-
             # ORCA does not provide CI coefficients for full TDDFT calculations
             # without the TDA approximation, and cclib parser then returns NaNs in the 'etsecs' field.
             # In this case we're deleting the entry, which seems safer than returning bogus info.
-            # This is not handled by the code above because the value is not a numpy array.
+            # The value is not a numpy array, so it cannot be moved to the `output_arrays` either.
             if 'etsecs' in parsed_dictionary and np.isnan(parsed_dictionary['etsecs'][0][0][-1]):
                 self.logger.info(
                     'ORCA does not print CI coefficients for full TDDFT, removing "etsecs" field from output dict'
@@ -80,26 +327,127 @@ class OrcaBaseParser(Parser):
 
         output_dict = _remove_nan(parsed_dict)
 
+        if parser_settings.get('profile', False):
+            self._report_section_profile(output_dict['metadata'])
+
+        # The geometries may be moved to the output arrays.
+        last_geometry = (output_dict.get('atomnos'), output_dict.get('atomcoords'))
+        output_arrays = self._split_arrays(output_dict, parser_settings.get('array_threshold', array_threshold))
+        if output_arrays is not None:
+            outputs['output_arrays'] = output_arrays
+
         if parsed_dict.get('optdone'):
-            # Change this when we drop AiiDA 1.x support
-            #with self.retrieved.base.repository.open(fname_relaxed) as handle:
-            with self.retrieved.open(fname_relaxed) as handle:
-                ase_structure = ase.io.read(handle, format='xyz', index=0)
+            try:
+                with self._open(fname_relaxed) as handle:
+                    ase_structure = ase.io.read(handle, format='xyz', index=0)
+            except FileNotFoundError:
+                # E.g. imported calculations whose structure file was not kept, the last geometry being the same.
+                self.logger.warning(f'{fname_relaxed} is missing, the relaxed structure is the last geometry')
+                ase_structure = None
+                if last_geometry[0] is not None and last_geometry[1] is not None:
+                    ase_structure = ase.Atoms(numbers=last_geometry[0], positions=last_geometry[1][-1])
             if not ase_structure:
                 self.logger.error(f'Could not read structure from output file {fname_relaxed}')
-                return self.exit_codes.ERROR_OUTPUT_PARSING
+                return outputs, self.exit_codes.ERROR_OUTPUT_PARSING
             # Temporary hack to support AiiDA 1.x, which needs default cell
             # even for non-periodic structures.
             ase_structure.set_cell([1.0, 1.0, 1.0])
             relaxed_structure = StructureData(ase=ase_structure)
-            self.out('relaxed_structure', relaxed_structure)
+            outputs['relaxed_structure'] = relaxed_structure
 
         if output_dict.get('atomnos') is not None:
             pt = PeriodicTable()  # pylint: disable=invalid-name
             output_dict['elements'] = [pt.element[Z] for Z in output_dict['atomnos']]
 
-        self.out('output_parameters', Dict(dict=output_dict))
+        outputs['output_parameters'] = Dict(dict=output_dict)
+
+        # The optimization reached the maximum number of cycles, which ORCA only reports in a warning.
+        if parsed_dict.get('optdone') is False:
+            return outputs, self.exit_codes.ERROR_OPTIMIZATION_NOT_CONVERGED
 
         if output_dict.get('metadata') and output_dict['metadata'].get('success'):
-            return ExitCode(0)
+            return outputs, ExitCode(0)
+        return outputs, self._unsuccessful_exit_code(tail, *output_dict.get('metadata', {}).get('warnings', []))
+
+    def _unsuccessful_exit_code(self, *texts: str) -> ExitCode:
+        """Return the exit code of a calculation that did not terminate normally.
+
+        The failure is classified from the messages of ORCA, or as a walltime kill from the stderr of the scheduler.
+
+        Args:
+            texts (str): End of the output and other messages of ORCA, e.g. its warnings
+
+        Returns:
+            ExitCode: The exit code of the failure, or ``ERROR_CALCULATION_UNSUCCESSFUL`` if it is not classified
+        """
+        error = classify_error(*texts)
+        if error is not None:
+            return self.exit_codes[error]
+
+        fname_stderr = self.node.get_option('scheduler_stderr')
+        if fname_stderr in self._list_object_names():
+            with self._open(fname_stderr, 'rb') as handle:
+                if killed_by_walltime(read_tail(handle)):
+                    return self.exit_codes.ERROR_OUT_OF_WALLTIME
+
         return self.exit_codes.ERROR_CALCULATION_UNSUCCESSFUL
+
+    @staticmethod
+    def _split_arrays(output_dict: dict, threshold: int) -> t.Optional[ArrayData]:
+        """Move the array attributes with more elements than the threshold from the output dictionary to an
+        ``ArrayData``, where they are stored as binary files instead of in the database.
+
+        Array attributes with NaN or infinite values are moved regardless of their size, since the values cannot be
+        stored in a ``Dict`` but are kept as they are in an ``ArrayData``. Checking for them does not copy the arrays.
+
+        Attributes that are lists of arrays, like ``mocoeffs`` with one array per spin, are split into arrays named
+        after the attribute and their index. The names of the arrays are recorded in place of the attributes under the
+        ``arrays`` key of the output dictionary.
+
+        Args:
+            output_dict (dict): Parsed dictionary, modified in place
+            threshold (int): Number of elements above which an attribute is moved
+
+        Returns:
+            ArrayData: The moved attributes, or ``None`` if no attribute was large enough
+        """
+        import numpy as np
+
+        output_arrays = ArrayData()
+        references = {}
+
+        for key, value in sorted(output_dict.items()):
+            if isinstance(value, np.ndarray):
+                if value.size > threshold or not _is_finite(value):
+                    output_arrays.set_array(key, value)
+                    references[key] = key
+            elif isinstance(value, list) and value and all(isinstance(item, np.ndarray) for item in value):
+                if sum(item.size for item in value) > threshold or not all(_is_finite(item) for item in value):
+                    references[key] = [f'{key}_{index}' for index in range(len(value))]
+                    for name, item in zip(references[key], value):
+                        output_arrays.set_array(name, item)
+
+        if not references:
+            return None
+
+        for key in references:
+            del output_dict[key]
+        output_dict['arrays'] = references
+
+        return output_arrays
+
+    def _report_section_profile(self, metadata: dict) -> None:
+        """Log the time, lines and bytes spent in each section of the output, the most expensive first.
+
+        Args:
+            metadata (dict): Parsed ``metadata`` holding the ``parse_time`` and ``section_profile``
+        """
+        profile = metadata['section_profile']
+        parse_time = metadata['parse_time']
+        lines = [f'Parsed the output in {parse_time:.3f} s, of which in sections:']
+        for name, entry in sorted(profile.items(), key=lambda item: item[1]['time'], reverse=True):
+            lines.append(
+                f'  {name:<32} {entry["time"]:9.4f} s {entry["calls"]:6d} calls {entry["lines"]:10d} lines '
+                f'{entry["bytes"]:12d} bytes'
+            )
+        self.logger.info('\n'.join(lines))
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""AiiDA-ORCA output parser of batch calculations"""
+import posixpath
+import tempfile
+import traceback
+import typing as t
+
+from aiida.engine import ExitCode
+from aiida.orm import Dict
+
+from . import OrcaBaseParser, read_output
+from .pool import copy_to_directory, get_executor
+
+# Output of an item parsed into the output namespaces of the batch calculation, by the link label for single outputs.
+_OUTPUT_NAMESPACES = {
+    'output_parameters': 'output_parameters',
+    'output_arrays': 'output_arrays',
+    'relaxed_structure': 'relaxed_structures',
+}
+
+
+class OrcaBatchParser(OrcaBaseParser):
+    """AiiDA parser for the outputs of the items of an ``OrcaBatchCalculation``, each parsed as by the
+    ``OrcaBaseParser``. The outputs can be parsed in parallel, by ``max_workers`` processes."""
+
+    def parse(self, **kwargs):
+        """Parse the output of each item into the output namespaces, keyed by the name of the item.
+
+        The exit status and message of each item are added to its output parameters. The calculation fails with
+        ``ERROR_ITEMS_UNSUCCESSFUL`` if any item does, or ``ERROR_OUTPUT_STDOUT_MISSING`` if no item has an output.
+        """
+        process_cls = self.node.process_class
+        parser_settings = self._get_parser_settings()
+
+        try:
+            items = sorted(self.node.inputs.structures)
+        except AttributeError:
+            # Change this when we drop AiiDA 1.x support, which has no nested namespaces in the links manager
+            prefix = 'structures__'
+            labels = self.node.get_incoming().all_link_labels()
+            items = sorted(label[len(prefix):] for label in labels if label.startswith(prefix))
+
+        fnames_out = {}
+        for item in items:
+            fname_out = posixpath.join(item, process_cls._OUTPUT_FILE)  # pylint: disable=protected-access
+            if self._has_object(fname_out):
+                fnames_out[item] = fname_out
+        if not fnames_out:
+            return self.exit_codes.ERROR_OUTPUT_STDOUT_MISSING
+
+        results = {}
+        tails = {}
+        for item, fname_out in fnames_out.items():
+            tails[item] = self._read_output_tail(fname_out)
+            result = self._check_fatal_error(tails[item], parser_settings)
+            if result is not None:
+                results[item] = result
+
+        parsed = self._read_outputs({item: fnames_out[item] for item in fnames_out if item not in results},
+                                    parser_settings)
+
+        failed = []
+        for item in items:
+            if item not in fnames_out:
+                self.logger.error(f'The output of the item {item} was not retrieved')
+                result = ({}, self.exit_codes.ERROR_OUTPUT_STDOUT_MISSING)
+            elif item in results:
+                result = results[item]
+            elif parsed[item] is None:
+                result = ({}, self.exit_codes.ERROR_OUTPUT_STDOUT_PARSE)
+            else:
+                fname_relaxed = posixpath.join(item, process_cls._RELAX_COORDS_FILE)  # pylint: disable=protected-access
+                result = self._process_output(parsed[item], tails[item], parser_settings, fname_relaxed)
+
+            outputs, exit_code = result
+            output_parameters = outputs.setdefault('output_parameters', Dict(dict={}))
+            output_parameters['exit_status'] = exit_code.status
+            output_parameters['exit_message'] = exit_code.message
+            for link_label, node in outputs.items():
+                self.out(f'{_OUTPUT_NAMESPACES[link_label]}.{item}', node)
+            if exit_code.status != 0:
+                failed.append(item)
+
+        if failed:
+            return self.exit_codes.ERROR_ITEMS_UNSUCCESSFUL.format(items=', '.join(failed))
+        return ExitCode(0)
+
+    def _has_object(self, path: str) -> bool:
+        """Return whether the retrieved folder has a file at the given relative path."""
+        dirname, basename = posixpath.split(path)
+        try:
+            return basename in self.retrieved.list_object_names(dirname)
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+
+    def _read_outputs(self, fnames_out: t.Dict[str, str], parser_settings: dict) -> t.Dict[str, t.Optional[dict]]:
+        """Parse the outputs of the items with cclib, in parallel if ``max_workers`` is larger than one.
+
+        The processes of the pool cannot read from the repository, so the outputs are then copied to a temporary
+        directory. Outputs whose attributes are in the parse cache, if it is enabled, are not parsed again.
+
+        Args:
+            fnames_out (dict): Names of the retrieved outputs, by item
+            parser_settings (dict): Settings of the parser
+
+        Returns:
+            dict: The parsed attributes, by item, or ``None`` for the outputs that could not be parsed
+        """
+        max_workers = min(parser_settings.get('max_workers', 1), len(fnames_out))
+        parsed = {}
+
+        if max_workers <= 1:
+            for item, fname_out in fnames_out.items():
+                try:
+                    parsed[item] = self._read_output(fname_out, parser_settings)
+                except Exception:  # pylint: disable=broad-except
+                    self._log_parse_error(fname_out)
+                    parsed[item] = None
+            return parsed
+
+        keys = {}
+        for item, fname_out in fnames_out.items():
+            keys[item], parsed_dict = self._get_cached(fname_out, parser_settings)
+            if parsed_dict is not None:
+                parsed[item] = parsed_dict
+
+        with tempfile.TemporaryDirectory() as dirpath:
+            executor = get_executor(max_workers)
+            futures = {}
+            for item, fname_out in fnames_out.items():
+                if item not in parsed:
+                    filepath = copy_to_directory(self.retrieved, fname_out, dirpath, f'{item}.out')
+                    futures[item] = executor.submit(read_output, filepath, parser_settings)
+            for item, future in futures.items():
+                try:
+                    parsed[item] = future.result()
+                except Exception:  # pylint: disable=broad-except
+                    self._log_parse_error(fnames_out[item])
+                    parsed[item] = None
+                else:
+                    self._put_cached(keys[item], parsed[item])
+
+        return parsed
+
+    def _log_parse_error(self, fname_out: str) -> None:
+        """Log that cclib could not parse an output, with the traceback of the exception being handled."""
+        self.logger.error(f'ERROR: cclib could not parse file {fname_out}')
+        self.logger.error(f'{traceback.format_exc()}')
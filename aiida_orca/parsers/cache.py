@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""On-disk cache of parsed outputs, so that reparsing outputs that did not change, e.g. of archived calculations after
+a fix of the parser, skips the parse with cclib.
+
+The cache is enabled by setting ``AIIDA_ORCA_PARSE_CACHE`` to the path of its directory, which is created if needed,
+and is limited to ``AIIDA_ORCA_PARSE_CACHE_SIZE`` bytes, by default 1 GiB. Entries are keyed by the hash of the output,
+the version of the plugin and the settings that change what is parsed, so that upgrading the plugin invalidates them.
+Each entry holds the parsed attributes pickled, with the arrays as raw buffers, and compressed. The least recently
+used entries are removed when the cache grows beyond its size.
+
+The entries are unpickled, so the directory should only be writable by the users of the cache.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import typing as t
+import zlib
+
+ENV_DIRECTORY = 'AIIDA_ORCA_PARSE_CACHE'
+ENV_MAX_SIZE = 'AIIDA_ORCA_PARSE_CACHE_SIZE'
+DEFAULT_MAX_SIZE = 1024**3
+
+#: Version of the format of the entries, increased when it changes.
+FORMAT_VERSION = 1
+
+_SUFFIX = '.pkl.z'
+_CHUNK_SIZE = 1024**2
+
+
+def get_cache() -> t.Optional['ParseCache']:
+    """Return the cache configured by the environment, or ``None`` if ``AIIDA_ORCA_PARSE_CACHE`` is not set."""
+    dirpath = os.environ.get(ENV_DIRECTORY)
+    if not dirpath:
+        return None
+    max_size = int(os.environ.get(ENV_MAX_SIZE, DEFAULT_MAX_SIZE))
+    return ParseCache(dirpath, max_size)
+
+
+def cache_key(handle: t.BinaryIO, parser_settings: dict) -> t.Optional[str]:
+    """Return the key of an output in the cache.
+
+    Args:
+        handle (BinaryIO): Output opened in binary mode, read to its end
+        parser_settings (dict): Settings of the parser
+
+    Returns:
+        str: The key, or ``None`` if the output should not be cached, i.e. if it is profiled, since the times of a
+        profile only make sense for the parse that measured them
+    """
+    if parser_settings.get('profile', False):
+        return None
+
+    from aiida_orca import __version__
+
+    attributes = parser_settings.get('attributes')
+    digest = hashlib.sha256()
+    digest.update(f'{FORMAT_VERSION}:{__version__}:{sorted(attributes) if attributes is not None else None}:'.encode())
+    for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Directory of parsed outputs, with one file per entry, whose modification time is the time it was last used.
+
+    Args:
+        dirpath (str): Path of the directory, created if it does not exist
+        max_size (int): Total size in bytes of the entries, above which the least recently used are removed
+    """
+
+    def __init__(self, dirpath: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.dirpath = dirpath
+        self.max_size = max_size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.dirpath, key + _SUFFIX)
+
+    def get(self, key: str) -> t.Optional[dict]:
+        """Return the parsed attributes of an entry and mark it as used, or ``None`` if there is no valid entry."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as handle:
+                parsed = pickle.loads(zlib.decompress(handle.read()))
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, zlib.error, pickle.UnpicklingError):
+            # The entry was corrupted, e.g. by a full disk, and is replaced by the next parse.
+            self._remove(path)
+            return None
+        return parsed
+
+    def put(self, key: str, parsed: dict) -> None:
+        """Add an entry, then remove the least recently used entries if the cache is larger than its size.
+
+        The entry is written to a temporary file that replaces the entry at once, so that processes sharing the
+        cache never read a partial entry. The cache is only an optimization, so failing to write it is not an error.
+        """
+        data = zlib.compress(pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL))
+        if len(data) > self.max_size:
+            return
+        try:
+            os.makedirs(self.dirpath, exist_ok=True)
+            with tempfile.NamedTemporaryFile('wb', dir=self.dirpath, suffix='.tmp', delete=False) as handle:
+                try:
+                    handle.write(data)
+                except OSError:
+                    handle.close()
+                    self._remove(handle.name)
+                    raise
+            os.replace(handle.name, self._path(key))
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache is no larger than its size."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.dirpath) as iterator:
+                for entry in iterator:
+                    if entry.name.endswith(_SUFFIX):
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+        except FileNotFoundError:
+            return
+        if total <= self.max_size:
+            return
+        for _, size, path in sorted(entries):
+            self._remove(path)
+            total -= size
+            if total <= self.max_size:
+                break
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        try:
+            names = os.listdir(self.dirpath)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith(_SUFFIX):
+                self._remove(os.path.join(self.dirpath, name))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -8,7 +8,7 @@
 
 from . import orcaparser
 
-def ccread(source):
+def ccread(source, *args, **kwargs):
     """Attempt to open and read computational chemistry data from a file.
 
     If the file is not appropriate for cclib parsers, a fallback mechanism
@@ -18,10 +18,12 @@ def ccread(source):
     Inputs:
         source - a single logfile, a list of logfiles (for a single job),
                  an input stream, or an URL pointing to a log file.
-        *args, **kwargs - arguments and keyword arguments passed to ccopen
+        *args, **kwargs - arguments and keyword arguments passed to the parser, e.g.
+                          attributes to only parse the listed cclib attributes, or
+                          checkpoint to resume parsing a growing file (see ParserCheckpoint)
     Returns:
         a ccData object containing cclib data attributes
     """
 
-    log = orcaparser.ORCA(source)
+    log = orcaparser.ORCA(source, *args, **kwargs)
     return log.parse()
@@ -7,25 +7,42 @@
 # It is modified to be used as part of aiida-orca package.
 """Generic output file parser and related tools"""
 
+import codecs
+import copy
 import fileinput
+import hashlib
 import inspect
 import io
+import itertools
 import logging
+import mmap
+import os
 import random
+import stat as pystat
 import sys
 from abc import ABC, abstractmethod
 import numpy
 
 from .utils import str_contains_only, PeriodicTable
 from . import data
+from ..compressed import detect_compression, open_compressed
 
 
 class FileWrapper:
     """Wrap a file-like object or stream with some custom tweaks"""
-    def __init__(self, source, pos=0):
+    def __init__(self, source, pos=0, size=None, compressed=False):
 
         self.src = source
 
+        # Whether the source decompresses a file, which cannot be seeked without decompressing it again.
+        self.compressed = compressed
+        if size is not None:
+            self.size = size
+            self.pos = pos
+            self.lineno = 0
+            self.last_line = None
+            return
+
         # Most file-like objects have seek and tell methods, but streams returned
         # by urllib.urlopen in Python2 do not, which will raise an AttributeError
         # in this code. On the other hand, in Python3 these methods do exist since
@@ -48,14 +65,29 @@ class FileWrapper:
         # Assume the position is what was passed to the constructor.
         self.pos = pos
 
+        # Number of lines read so far.
+        self.lineno = 0
+
         self.last_line = None
 
     def next(self):
         line = next(self.src)
         self.pos += len(line)
+        self.lineno += 1
         self.last_line = line
         return line
 
+    def next_lines(self, count):
+        """Return the next count lines as a list, raising StopIteration if the file ends before."""
+        lines = list(itertools.islice(self.src, count))
+        if len(lines) < count:
+            raise StopIteration
+        if lines:
+            self.pos += sum(map(len, lines))
+            self.lineno += count
+            self.last_line = lines[-1]
+        return lines
+
     def __next__(self):
         return self.next()
 
@@ -86,22 +118,218 @@ class FileWrapper:
             self.pos = self.size
 
 
-def openlogfile(filename, object=None):
-    """Return a file object given a filename or if object specified decompresses it
-    if needed and wrap it up.
+class MmapFileWrapper:
+    """Memory-mapped line source with the same interface as FileWrapper.
+
+    The file is mapped read-only and consumed in blocks that end at a newline. Each block is only decoded
+    when it is reached and is split into lines in one go, so that no per-line work is done in Python apart
+    from the position bookkeeping. As in text mode, undecodable bytes are ignored and '\\r\\n' and '\\r'
+    line endings are translated to '\\n'. The position is counted in bytes at block boundaries and advanced
+    by the length of each decoded line in between, which is exact for ASCII outputs.
+    """
+
+    blocksize = 1 << 20
+
+    def __init__(self, source, pos=0, encoding='utf-8', close_source=False):
+
+        # Either a path or a file object backed by a real file descriptor.
+        if isinstance(source, str):
+            self.src = io.open(source, 'rb')
+            self.close_source = True
+        else:
+            self.src = source
+            self.close_source = close_source
+
+        self.map = mmap.mmap(self.src.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = len(self.map)
+        self.encoding = encoding
+
+        self.pos = pos
+        self.lineno = 0
+        self.last_line = None
+
+        self._block_end = pos
+        self._lines = iter(())
+
+    def _read_block(self):
+        """Decode and split the next block of the mapped file, ending the block at a newline."""
+        start = self._block_end
+        if start >= self.size:
+            raise StopIteration
+        end = min(start + self.blocksize, self.size)
+        if end < self.size:
+            newline = self.map.rfind(b'\n', start, end)
+            if newline < 0:
+                newline = self.map.find(b'\n', end)
+            end = self.size if newline < 0 else newline + 1
+        text = self.map[start:end].decode(self.encoding, 'ignore')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        self.pos = start
+        self._block_end = end
+        self._lines = iter(io.StringIO(text, newline='\n').readlines())
+
+    def next(self):
+        try:
+            line = next(self._lines)
+        except StopIteration:
+            self._read_block()
+            line = next(self._lines)
+        self.pos += len(line)
+        self.lineno += 1
+        self.last_line = line
+        return line
+
+    def next_lines(self, count):
+        """Return the next count lines as a list, raising StopIteration if the file ends before."""
+        lines = list(itertools.islice(self._lines, count))
+        self.pos += sum(map(len, lines))
+        while len(lines) < count:
+            self._read_block()
+            more = list(itertools.islice(self._lines, count - len(lines)))
+            self.pos += sum(map(len, more))
+            lines.extend(more)
+        if lines:
+            self.lineno += count
+            self.last_line = lines[-1]
+        return lines
+
+    def __next__(self):
+        return self.next()
+
+    def __iter__(self):
+        return self
+
+    def close(self):
+        self.map.close()
+        if self.close_source:
+            self.src.close()
+
+    def seek(self, pos, ref):
+        if ref == 1:
+            pos += self.pos
+        elif ref == 2:
+            pos += self.size
+        self.pos = self._block_end = min(max(pos, 0), self.size)
+        self._lines = iter(())
+
 
-    Given the filename or file object of a log file or a gzipped, zipped, or bzipped
-    log file, this function returns a file-like object.
+def mappable_fileobj(stream):
+    """Return the raw file object underlying a stream if it is a regular, non-empty file, otherwise None.
 
-    Given a list of filenames, this function returns a FileInput object,
-    which can be used for seamless iteration without concatenation.
+    Streams from the AiiDA file repository are opened in text mode on top of a buffered reader. Only when
+    the innermost object is an io.FileIO is the whole file descriptor guaranteed to hold just this file, as
+    opposed to e.g. an object stored in a pack of the disk-objectstore.
     """
+    raw = stream
+    for attribute in ('buffer', 'raw'):
+        raw = getattr(raw, attribute, raw)
+    if not isinstance(raw, io.FileIO) or raw.closed:
+        return None
+    try:
+        stat = os.fstat(raw.fileno())
+    except OSError:
+        return None
+    if not pystat.S_ISREG(stat.st_mode) or stat.st_size == 0:
+        return None
+    return raw
+
+
+def openlogfile(filename, object=None):
+    """Return a file object given a filename, decompressing the file if needed, and wrap it up.
+
+    Given the filename of a log file or of a gzip, bzip2, xz or zstd compressed log file,
+    which is recognized by its magic number, this function returns a file-like object.
+    Compressed files are decompressed as they are read.
+    """
+
+    if os.path.isfile(filename) and os.path.getsize(filename) > 0:
+        with io.open(filename, 'rb') as handle:
+            compression = detect_compression(handle)
+        if compression is not None:
+            return FileWrapper(open_compressed(filename, compression),
+                               size=os.path.getsize(filename),
+                               compressed=True)
+        return MmapFileWrapper(filename)
 
     fileobject = FileWrapper(io.open(filename, 'r', errors='ignore'))
 
     return fileobject
 
 
+def openlogstream(stream):
+    """Wrap a stream, memory-mapping it when it is backed by a regular file.
+
+    Compressed streams are decompressed as they are read, from the binary buffer of
+    text streams. Binary streams are decoded as UTF-8 ignoring undecodable bytes,
+    as text streams are opened by the parser.
+    """
+    binary = getattr(stream, 'buffer', None) if isinstance(stream, io.TextIOBase) else stream
+    compression = detect_compression(binary) if binary is not None else None
+    if compression is not None:
+        return FileWrapper(open_compressed(binary, compression), size=0, compressed=True)
+
+    raw = mappable_fileobj(stream)
+    if raw is not None:
+        return MmapFileWrapper(raw)
+    if binary is stream:
+        stream = codecs.getreader('utf-8')(stream, errors='ignore')
+    return FileWrapper(stream)
+
+
+class ParserCheckpoint:
+    """State of a parser at a line boundary of a log file, from which parsing resumes when more has been written.
+
+    Pass the same instance to every parse of a growing file, for example to monitor a running job:
+
+        checkpoint = ParserCheckpoint()
+        data = ccread(filename, checkpoint=checkpoint)
+        ...
+        data = ccread(filename, checkpoint=checkpoint)
+
+    The first call parses the whole file, later calls only what was appended since the previous one. The
+    checkpoint is updated in place after each parse, at the end of the file or, if the file ends within a
+    section, at the line opening that section, which is parsed again from the start next time. The start and
+    the end of the file before the checkpoint are fingerprinted, and a file that does not match them is parsed
+    from the start. Checkpoints can be pickled, but they are only used for files that can be memory mapped.
+    """
+
+    fingerprint_size = 4096
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget the state, so that the next file is parsed from the start."""
+        self.offset = 0
+        self.lineno = 0
+        self.state = None
+        self.fingerprint = None
+
+    @classmethod
+    def fingerprint_of(cls, inputfile, offset):
+        """Return the fingerprint of the start and the end of the file before the offset."""
+        head = inputfile.map[:min(offset, cls.fingerprint_size)]
+        tail = inputfile.map[max(offset - cls.fingerprint_size, 0):offset]
+        return hashlib.sha1(head + tail).hexdigest()
+
+    def matches(self, inputfile):
+        """Return whether the file is the one checkpointed, possibly with lines appended since."""
+        return (self.state is not None and isinstance(inputfile, MmapFileWrapper) and
+                inputfile.size >= self.offset and
+                self.fingerprint == self.fingerprint_of(inputfile, self.offset))
+
+    def update(self, inputfile, offset, lineno, state):
+        """Record the state of the parser at an offset of the file, which must be at the start of a line."""
+        if offset > 0 and inputfile.map[offset - 1:offset] != b'\n':
+            self.reset()
+            return
+        self.offset = offset
+        self.lineno = lineno
+        self.state = state
+        self.fingerprint = self.fingerprint_of(inputfile, offset)
+
+
 class Logfile(ABC):
     """Abstract class for logfile objects.
 
@@ -190,6 +418,12 @@ class Logfile(ABC):
         # Parsing of Natural Orbitals and Natural Spin Orbtials into one attribute
         self.unified_no_nso = kwds.get('future', False)
 
+        # A ParserCheckpoint to resume parsing from and to update, see its documentation.
+        self.checkpoint = kwds.get('checkpoint', None)
+
+    # Attributes set while parsing that are not part of the state saved in checkpoints.
+    checkpoint_exclude = ('progress', 'fupdate', 'cupdate')
+
     def __setattr__(self, name, value):
 
         # Send info to logger if the attribute is in the list of attributes.
@@ -234,10 +468,10 @@ class Logfile(ABC):
             else:
                 inputfile = self.filename
         else:
-            inputfile = FileWrapper(self.stream)
+            inputfile = openlogstream(self.stream)
 
         # Intialize self.progress
-        is_compressed = False
+        is_compressed = getattr(inputfile, 'compressed', False)
         if progress and not (is_compressed):
             self.progress = progress
             self.progress.initialize(inputfile.size)
@@ -245,14 +479,34 @@ class Logfile(ABC):
         self.fupdate = fupdate
         self.cupdate = cupdate
 
+        # Checkpoints rely on the byte offsets of memory mapped files.
+        checkpoint = self.checkpoint
+        if checkpoint is not None and not isinstance(inputfile, MmapFileWrapper):
+            self.logger.warning('Parsing can only be resumed for files that can be memory mapped.')
+            checkpoint.reset()
+            checkpoint = None
+        if checkpoint is not None:
+            metadata = copy.deepcopy(self.metadata)
+            resumed = checkpoint.matches(inputfile)
+            if not resumed and checkpoint.state is not None:
+                self.logger.info('The file does not match the checkpoint, parsing it from the start.')
+
         # Maybe the sub-class has something to do before parsing.
         self.before_parsing()
 
+        if checkpoint is not None and resumed:
+            self._resume(inputfile, checkpoint)
+
         # Loop over lines in the file object and call extract().
         # This is where the actual parsing is done.
+        interrupted = False
         for line in inputfile:
             self.updateprogress(inputfile, 'Unsupported information', cupdate)
 
+            # The line boundary at which the current section starts, for the checkpoint.
+            if checkpoint is not None:
+                start = (inputfile.pos - len(line), inputfile.lineno - 1)
+
             # This call should check if the line begins a section of extracted data.
             # If it does, it parses some lines and sets the relevant attributes (to self).
             # Any attributes can be freely set and used across calls, however only those
@@ -260,15 +514,34 @@ class Logfile(ABC):
             try:
                 self.extract(inputfile, line)
             except StopIteration:
-                self.logger.error('Unexpectedly encountered end of logfile.')
+                if checkpoint is not None:
+                    self.logger.info('The file ends within a section, which is parsed again when resuming.')
+                else:
+                    self.logger.error('Unexpectedly encountered end of logfile.')
+                interrupted = True
                 break
             except Exception as e:
+                # A section cut within its last line by the end of a file being written is an interruption as well.
+                if checkpoint is not None and inputfile.pos >= inputfile.size and not inputfile.last_line.endswith('\n'):
+                    self.logger.info('The file ends within a section, which is parsed again when resuming.')
+                    interrupted = True
+                    break
                 self.logger.error('Encountered error when parsing.')
                 self.logger.error(f'Last line read: {inputfile.last_line}')
                 raise
 
-        # Close input file object.
-        if not self.isstream:
+        # A file being written may end with an incomplete line, which is read again when resuming.
+        if checkpoint is not None:
+            if interrupted or (inputfile.last_line and not inputfile.last_line.endswith('\n')):
+                state = self._replay(inputfile, checkpoint if resumed else None, start[0], _nodelete, metadata)
+                checkpoint.update(inputfile, *start, state)
+            else:
+                state = copy.deepcopy(self._checkpoint_state(_nodelete))
+                checkpoint.update(inputfile, inputfile.size, inputfile.lineno, state)
+
+        # Close input file object. A memory map over a stream, or its decompression, is closed as well,
+        # but not the stream itself.
+        if not self.isstream or isinstance(inputfile, MmapFileWrapper) or is_compressed:
             inputfile.close()
 
         # Maybe the sub-class has something to do after parsing.
@@ -317,6 +590,48 @@ class Logfile(ABC):
 
         return data
 
+    def _checkpoint_state(self, nodelete):
+        """Return the attributes set while parsing, and the metadata, which make up the state of a checkpoint."""
+        return {
+            name: value
+            for name, value in self.__dict__.items()
+            if (name not in nodelete or name == 'metadata') and name not in self.checkpoint_exclude
+        }
+
+    def _resume(self, inputfile, checkpoint):
+        """Restore the state of the checkpoint and position the file at its offset."""
+        self.__dict__.update(copy.deepcopy(checkpoint.state))
+        inputfile.seek(checkpoint.offset, 0)
+        inputfile.lineno = checkpoint.lineno
+
+    def _replay(self, inputfile, checkpoint, stop, nodelete, metadata):
+        """Return the state of the parser at the stop offset, parsing the file again from the checkpoint.
+
+        This is only needed when the file ends within a section, whose handler has already modified the state.
+        The attributes parsed up to the end of the file are restored afterwards.
+        """
+        parsed = dict(self.__dict__)
+        for name in list(self.__dict__):
+            if name not in nodelete:
+                delattr(self, name)
+        self.metadata = copy.deepcopy(metadata)
+        self.before_parsing()
+        if checkpoint is not None:
+            self._resume(inputfile, checkpoint)
+        else:
+            inputfile.seek(0, 0)
+            inputfile.lineno = 0
+
+        for line in inputfile:
+            if inputfile.pos - len(line) >= stop:
+                break
+            self.extract(inputfile, line)
+
+        state = self._checkpoint_state(nodelete)
+        self.__dict__.clear()
+        self.__dict__.update(parsed)
+        return state
+
     def before_parsing(self):
         """Set parser-specific variables and do other initial things here."""
         pass
@@ -59,6 +59,29 @@ def skip_until_no_match(inputfile, regex):
     return line
 
 
+def read_lines(inputfile, count):
+    """Read a known number of lines at once, as a list.
+
+    The file wrappers of cclib read the lines in bulk, other iterators line by line.
+    """
+    if hasattr(inputfile, 'next_lines'):
+        return inputfile.next_lines(count)
+    return [next(inputfile) for _ in range(count)]
+
+
+def skip_line_count(inputfile, count):
+    """Skip a known number of lines without looking at them. The last line skipped is returned.
+
+    Sections of a fixed layout can be read past this way much faster than they are parsed.
+    """
+    line = None
+    while count > 0:
+        lines = read_lines(inputfile, min(count, 4096))
+        count -= len(lines)
+        line = lines[-1]
+    return line
+
+
 def str_contains_only(string, chars):
     """Checks if string contains only the specified characters.
     """
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Detection and streaming decompression of outputs compressed with gzip, bzip2, xz or zstd.
+
+Outputs are recognized by the magic number at their start rather than by their name, so that an output is read the
+same whether it was compressed on the remote, see the ``compress_output`` option of the ``OrcaCalculation``, or
+imported compressed. zstd requires Python 3.14 or the ``zstandard`` package.
+"""
+import typing as t
+
+#: Magic numbers at the start of compressed files, by compression.
+MAGIC_NUMBERS = {
+    'gzip': b'\x1f\x8b',
+    'bzip2': b'BZh',
+    'xz': b'\xfd7zXZ\x00',
+    'zstd': b'\x28\xb5\x2f\xfd',
+}
+
+#: Extensions of the compressed files, by compression.
+EXTENSIONS = {'gzip': '.gz', 'bzip2': '.bz2', 'xz': '.xz', 'zstd': '.zst'}
+
+#: Commands that compress a file in place, adding the extension of the compression to its name.
+COMMANDS = {'gzip': 'gzip -f', 'bzip2': 'bzip2 -f', 'xz': 'xz -f', 'zstd': 'zstd -q -f --rm'}
+
+
+def detect_compression(handle: t.BinaryIO) -> t.Optional[str]:
+    """Return the compression of a stream opened in binary mode, without consuming it.
+
+    Args:
+        handle (BinaryIO): Stream at its start, which is peeked at if it can be, and otherwise read and seeked back
+            if it is seekable
+
+    Returns:
+        str: The compression, one of ``MAGIC_NUMBERS``, or ``None`` if the stream is not compressed or is empty
+    """
+    size = max(len(magic) for magic in MAGIC_NUMBERS.values())
+    if hasattr(handle, 'peek'):
+        start = handle.peek(size)[:size]
+    elif not getattr(handle, 'seekable', lambda: False)():
+        return None
+    else:
+        position = handle.tell()
+        start = handle.read(size)
+        handle.seek(position)
+    for compression, magic in MAGIC_NUMBERS.items():
+        if start.startswith(magic):
+            return compression
+    return None
+
+
+def open_compressed(source: t.Union[str, t.BinaryIO], compression: str, mode: str = 'rt') -> t.IO:
+    """Open a compressed file for reading, decompressing it as it is read.
+
+    Args:
+        source (str or BinaryIO): Path of the file, or the file opened in binary mode, which is not closed with the
+            returned stream
+        compression (str): Compression of the file, one of ``MAGIC_NUMBERS``
+        mode (str): ``rt`` to decode the file as UTF-8, ignoring undecodable bytes as the parser does, or ``rb``
+
+    Returns:
+        IO: The decompressed stream
+
+    Raises:
+        ImportError: If the file is compressed with zstd and neither Python 3.14 nor ``zstandard`` is installed
+    """
+    kwargs = {'encoding': 'utf-8', 'errors': 'ignore'} if 't' in mode else {}
+    if compression == 'gzip':
+        import gzip
+        return gzip.open(source, mode, **kwargs)
+    if compression == 'bzip2':
+        import bz2
+        return bz2.open(source, mode, **kwargs)
+    if compression == 'xz':
+        import lzma
+        return lzma.open(source, mode, **kwargs)
+    if compression == 'zstd':
+        try:
+            from compression import zstd  # pylint: disable=import-error
+            return zstd.open(source, mode, **kwargs)
+        except ImportError:
+            pass
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('Reading zstd compressed outputs requires Python 3.14 or the zstandard package')
+        return zstandard.open(source, mode, closefd=isinstance(source, str), **kwargs)
+    raise ValueError(f'Unknown compression: {compression}')
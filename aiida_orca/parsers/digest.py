@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Truncated digest of ORCA outputs, kept in the provenance in place of outputs that are only retrieved for the parser,
+see the ``temporary_files`` and ``output_digest`` options of the ``OrcaCalculation``.
+
+The digest holds the header of the output, up to the end of the echo of the input, its warnings and final single point
+energies, with the numbers of their lines, and its last lines, which tell how ORCA terminated.
+"""
+import collections
+import typing as t
+
+#: Line that ends the echo of the input, and so the header of the output.
+END_OF_INPUT = '****END OF INPUT****'
+
+#: Maximum number of lines of the header, of warnings and of final energies, and number of last lines.
+HEADER_LINES = 500
+MAX_WARNINGS = 200
+MAX_ENERGIES = 1000
+TAIL_LINES = 100
+
+
+def write_digest(stream: t.Iterable[str]) -> str:
+    """Return the digest of an output, read line by line, so that only the lines kept in the digest are in memory.
+
+    Args:
+        stream (iterable): Lines of the output, e.g. the output opened in text mode
+
+    Returns:
+        str: The digest, with a section per part of the output
+    """
+    header: t.List[str] = []
+    warnings: t.List[str] = []
+    energies: t.List[str] = []
+    tail: t.Deque[str] = collections.deque(maxlen=TAIL_LINES)
+    in_header = True
+    number = 0
+
+    for number, line in enumerate(stream, 1):
+        line = line.rstrip('\n')
+        if in_header:
+            if len(header) < HEADER_LINES:
+                header.append(line)
+            in_header = END_OF_INPUT not in line
+        if line.startswith('WARNING') and len(warnings) < MAX_WARNINGS:
+            warnings.append(f'{number}: {line}')
+        elif line.startswith('FINAL SINGLE POINT ENERGY') and len(energies) < MAX_ENERGIES:
+            energies.append(f'{number}: {line}')
+        tail.append(line)
+
+    sections = (
+        (f'HEADER ({len(header)} lines)', header),
+        (f'WARNINGS ({len(warnings)} lines)', warnings),
+        (f'FINAL ENERGIES ({len(energies)} lines)', energies),
+        (f'TAIL (last {len(tail)} of {number} lines)', list(tail)),
+    )
+    return '\n'.join(f'=== {title} ===\n' + ''.join(f'{line}\n' for line in lines) for title, lines in sections)
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""Parse of directories of ORCA outputs with cclib outside of AiiDA, and export of their attributes to Parquet.
+
+The attributes with a single value are the columns of a table with one row per output, ``jobs.parquet``, with the
+``job_id`` and ``path`` of the output and, if it could not be parsed, the ``parse_error``. Dictionaries and lists of
+values are encoded as JSON. Each attribute holding arrays has a table of its own, ``arrays/<attribute>.parquet``, with
+one row per array, holding the ``job_id`` of its output, its ``index`` in the attributes that are lists of arrays, like
+``mocoeffs`` with one array per spin, its ``shape`` and its flattened ``values``.
+
+Writing the tables requires ``pyarrow``, installed with the ``export`` extra of the plugin.
+"""
+import concurrent.futures
+import glob
+import json
+import multiprocessing
+import os
+import typing as t
+
+from . import read_output
+
+#: Number of arrays, and of bytes of their values, of an attribute above which they are written as a row group.
+ROW_GROUP_SIZE = 1000
+ROW_GROUP_BYTES = 64 * 1024**2
+
+
+def find_outputs(paths: t.Iterable[str], pattern: str = '*.out') -> t.List[str]:
+    """Return the outputs at the given paths, in a deterministic order.
+
+    Args:
+        paths (list): Paths of outputs, of directories searched recursively for outputs, or glob patterns of either
+        pattern (str): Glob pattern of the names of the outputs in the directories
+
+    Returns:
+        list: The sorted paths of the outputs, each once
+    """
+    outputs = set()
+    for path in paths:
+        for match in (glob.glob(path, recursive=True) if glob.has_magic(path) else [path]):
+            if os.path.isdir(match):
+                outputs.update(glob.glob(os.path.join(glob.escape(match), '**', pattern), recursive=True))
+            elif os.path.isfile(match):
+                outputs.add(match)
+    return sorted(outputs)
+
+
+def parse_path(path: str, parser_settings: dict) -> t.Tuple[t.Optional[dict], t.Optional[str]]:
+    """Parse an output, in a process of the pool, returning the error rather than raising it.
+
+    The sections of the output that set requested ``attributes`` also set others, which are left out, apart from the
+    ``metadata``.
+
+    Returns:
+        tuple: The parsed attributes, or ``None`` if the output could not be parsed, and the error
+    """
+    try:
+        parsed = read_output(path, parser_settings)
+    except Exception as exception:  # pylint: disable=broad-except
+        return None, f'{type(exception).__name__}: {exception}'
+    attributes = parser_settings.get('attributes')
+    if attributes is not None:
+        parsed = {key: value for key, value in parsed.items() if key in attributes or key == 'metadata'}
+    return parsed, None
+
+
+def parse_paths(paths: t.Sequence[str],
+                parser_settings: dict,
+                max_workers: int = 1) -> t.Iterator[t.Tuple[str, t.Optional[dict], t.Optional[str]]]:
+    """Parse outputs in a pool of ``max_workers`` processes, or in this process if it is one.
+
+    Args:
+        paths (list): Paths of the outputs
+        parser_settings (dict): Settings of the parser, of which ``attributes`` is used
+        max_workers (int): Number of processes
+
+    Returns:
+        iterator: The path, parsed attributes and error of each output, see ``parse_path``, in the order of the paths
+    """
+    if max_workers <= 1:
+        for path in paths:
+            yield (path, *parse_path(path, parser_settings))
+        return
+
+    # The outputs are sent to the processes in chunks, which are small enough to balance the load of the processes.
+    chunksize = max(1, min(16, len(paths) // (4 * max_workers)))
+    with concurrent.futures.ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        results = pool.map(parse_path, paths, [parser_settings] * len(paths), chunksize=chunksize)
+        for path, result in zip(paths, results):
+            yield (path, *result)
+
+
+def _to_json(value) -> str:
+    """Encode a value as JSON, with the numpy arrays and numbers in it as lists and numbers."""
+    return json.dumps(value, default=lambda obj: obj.tolist() if hasattr(obj, 'tolist') else str(obj))
+
+
+class ParquetExporter:
+    """Writer of the parsed attributes of outputs to the Parquet tables of a directory, see the module docstring.
+
+    The arrays are written as they are added, in row groups of ``ROW_GROUP_SIZE`` arrays at most, while the single
+    values are kept until ``close``, since the columns of the table of outputs are only known once every output is
+    added.
+
+    Args:
+        dirpath (str): Path of the directory, created if it does not exist
+    """
+
+    def __init__(self, dirpath: str):
+        import pyarrow  # pylint: disable=unused-import
+
+        self.dirpath = dirpath
+        self.rows: t.List[dict] = []
+        self._arrays: t.Dict[str, list] = {}
+        self._nbytes: t.Dict[str, int] = {}
+        self._dtypes: t.Dict[str, 'numpy.dtype'] = {}
+        self._writers: t.Dict[str, 'pyarrow.parquet.ParquetWriter'] = {}
+        os.makedirs(os.path.join(dirpath, 'arrays'), exist_ok=True)
+
+    def add(self, path: str, parsed: t.Optional[dict], error: t.Optional[str] = None) -> int:
+        """Add the parsed attributes of an output.
+
+        Args:
+            path (str): Path of the output
+            parsed (dict): The parsed attributes, or ``None`` if the output could not be parsed
+            error (str): Error raised by the parse of the output
+
+        Returns:
+            int: The ``job_id`` of the output
+        """
+        import numpy as np
+
+        job_id = len(self.rows)
+        row = {'job_id': job_id, 'path': path, 'parse_error': error}
+        for key, value in sorted((parsed or {}).items()):
+            if isinstance(value, np.ndarray) and value.ndim == 0:
+                value = value.item()
+            if isinstance(value, np.generic):
+                value = value.item()
+            if isinstance(value, np.ndarray) and self._is_numeric(key, value):
+                self._add_array(key, job_id, 0, value)
+            elif isinstance(value, list) and value and all(
+                isinstance(item, np.ndarray) and self._is_numeric(key, item) for item in value
+            ):
+                for index, item in enumerate(value):
+                    self._add_array(key, job_id, index, item)
+            elif value is None or isinstance(value, (bool, int, float, str)):
+                row[key] = value
+            else:
+                row[key] = _to_json(value)
+        self.rows.append(row)
+        return job_id
+
+    def _is_numeric(self, key: str, array: 'numpy.ndarray') -> bool:
+        """Return whether an array can be stored in the table of its attribute, which holds the values of the type
+        of its first array, as booleans, 64-bit integers or 64-bit floats."""
+        if array.dtype.kind not in 'biuf':
+            return False
+        return key not in self._dtypes or self._dtypes[key].kind == (
+            'i' if array.dtype.kind == 'u' else array.dtype.kind
+        )
+
+    def _add_array(self, key: str, job_id: int, index: int, array: 'numpy.ndarray') -> None:
+        import numpy as np
+
+        if key not in self._dtypes:
+            self._dtypes[key] = np.dtype({'b': bool, 'i': np.int64, 'u': np.int64, 'f': np.float64}[array.dtype.kind])
+        values = array.astype(self._dtypes[key], copy=False).ravel()
+        arrays = self._arrays.setdefault(key, [])
+        arrays.append((job_id, index, array.shape, values))
+        self._nbytes[key] = self._nbytes.get(key, 0) + values.nbytes
+        if len(arrays) >= ROW_GROUP_SIZE or self._nbytes[key] >= ROW_GROUP_BYTES:
+            self._flush(key)
+
+    def _flush(self, key: str) -> None:
+        """Write the arrays of an attribute that were added since the last flush."""
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        arrays = self._arrays.pop(key, [])
+        self._nbytes.pop(key, None)
+        if not arrays:
+            return
+        job_ids, indices, shapes, values = zip(*arrays)
+        offsets = np.concatenate([[0], np.cumsum([len(value) for value in values])]).astype(np.int64)
+        table = pa.table({
+            'job_id': pa.array(job_ids, type=pa.int64()),
+            'index': pa.array(indices, type=pa.int64()),
+            'shape': pa.array([list(shape) for shape in shapes], type=pa.list_(pa.int64())),
+            'values': pa.LargeListArray.from_arrays(pa.array(offsets), pa.array(np.concatenate(values))),
+        })
+        if key not in self._writers:
+            filepath = os.path.join(self.dirpath, 'arrays', f'{key}.parquet')
+            self._writers[key] = pq.ParquetWriter(filepath, table.schema)
+        self._writers[key].write_table(table)
+
+    def close(self) -> None:
+        """Write the arrays that are left and the table of outputs.
+
+        The columns of the table of outputs are those of every attribute with a single value in any output, with
+        nulls for the outputs without it. The values of a column whose types cannot be stored together are encoded as
+        JSON instead.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        for key in list(self._arrays):
+            self._flush(key)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+        columns = {}
+        for row in self.rows:
+            for key in row:
+                columns.setdefault(key, None)
+        for key in columns:
+            values = [row.get(key) for row in self.rows]
+            try:
+                columns[key] = pa.array(values)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                columns[key] = pa.array([None if value is None else _to_json(value) for value in values])
+        pq.write_table(pa.table(columns), os.path.join(self.dirpath, 'jobs.parquet'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
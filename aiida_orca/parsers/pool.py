@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Pool of processes in which outputs are parsed outside of the process of the parser.
+
+``ccread`` is pure Python and holds the GIL for as long as it parses, up to minutes for huge outputs. While the parser
+waits for a parse in the pool, the other threads of the daemon worker, like the one of its communicator, keep running.
+The parsed attributes are sent back pickled, with their arrays as raw buffers, and the nodes are created by the parser.
+"""
+import concurrent.futures
+import multiprocessing
+import os
+import shutil
+import typing as t
+
+_executor: t.Optional[concurrent.futures.ProcessPoolExecutor] = None
+_max_workers = 0
+
+
+def get_executor(max_workers: int = 1) -> concurrent.futures.ProcessPoolExecutor:
+    """Return the pool shared by the parsers of this process, created on first use and kept for later parses.
+
+    The processes are spawned rather than forked, since forking a daemon worker, which runs other threads, is unsafe.
+
+    Args:
+        max_workers (int): Number of processes that the pool should have at least
+
+    Returns:
+        ProcessPoolExecutor: The pool, replaced by a larger one if it has fewer processes or if one of them died
+    """
+    global _executor, _max_workers  # pylint: disable=global-statement
+
+    broken = _executor is not None and getattr(_executor, '_broken', False)
+    if _executor is None or broken or _max_workers < max_workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _max_workers = max(_max_workers, max_workers)
+        _executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=_max_workers, mp_context=multiprocessing.get_context('spawn')
+        )
+    return _executor
+
+
+def copy_to_directory(retrieved, fname: str, dirpath: str, name: str) -> str:
+    """Copy a retrieved file to a directory, since the processes of the pool cannot read from the repository.
+
+    Args:
+        retrieved (FolderData): The retrieved folder
+        fname (str): Name of the file in the retrieved folder
+        dirpath (str): Path of the directory
+        name (str): Name of the copy
+
+    Returns:
+        str: The path of the copy
+    """
+    filepath = os.path.join(dirpath, name)
+    # Change this when we drop AiiDA 1.x support
+    # with retrieved.base.repository.open(fname, 'rb') as source, open(filepath, 'wb') as target:
+    with retrieved.open(fname, 'rb') as source, open(filepath, 'wb') as target:
+        shutil.copyfileobj(source, target)
+    return filepath
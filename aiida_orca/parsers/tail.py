@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Probe of the end of ORCA outputs, to tell how a calculation terminated and why it failed without parsing the
+whole output."""
+import io
+import typing as t
+
+#: Number of bytes read from the end of the output.
+TAIL_SIZE = 8192
+
+#: Lines that are only printed when ORCA terminates normally.
+NORMAL_TERMINATION = ('ORCA TERMINATED NORMALLY', 'TOTAL RUN TIME:')
+
+#: Messages of the fatal errors with which ORCA aborts, as printed by ORCA 4 and 5.
+FATAL_ERRORS = (
+    'ORCA finished by error termination',
+    'ORCA TERMINATED ABNORMALLY',
+    'aborting the run',
+    'INPUT ERROR',
+    'UNRECOGNIZED OR DUPLICATED KEYWORD(S)',
+)
+
+#: Messages of the errors classified by the name of their exit code, in order of precedence. They are matched
+#: regardless of case, since ORCA prints some of them in capitals and others not.
+ERROR_MESSAGES = (
+    ('ERROR_INPUT', ('input error', 'unrecognized or duplicated keyword')),
+    (
+        'ERROR_BASIS_SET_MISSING',
+        ('no basis function', 'not available for element', 'basis set not available', 'basis set not found')
+    ),
+    (
+        'ERROR_INSUFFICIENT_MEMORY',
+        ('not enough memory', 'insufficient memory', 'increase maxcore', 'out of memory', 'bad_alloc')
+    ),
+    ('ERROR_SCF_NOT_CONVERGED', ('scf not converged', 'wavefunction is not converged')),
+)
+
+#: Messages printed to the stderr of the job by SLURM, PBS, SGE and LSF when they kill it at the walltime.
+WALLTIME_MESSAGES = ('due to time limit', 'walltime', 'wallclock', 'term_runlimit')
+
+
+def read_tail(handle: t.BinaryIO, size: int = TAIL_SIZE) -> str:
+    """Read the end of an output opened in binary mode.
+
+    Args:
+        handle (BinaryIO): Output opened in binary mode
+        size (int): Number of bytes to read at most
+
+    Returns:
+        str: The end of the output, starting at a line boundary unless the whole output was read, or an empty
+        string if the output is not seekable
+    """
+    try:
+        end = handle.seek(0, io.SEEK_END)
+        start = max(end - size, 0)
+        handle.seek(start)
+        tail = handle.read().decode('utf-8', errors='ignore')
+    except (OSError, ValueError):
+        return ''
+    if start > 0:
+        tail = tail.partition('\n')[2]
+    return tail
+
+
+def read_stream_tail(handle: t.BinaryIO, size: int = TAIL_SIZE) -> str:
+    """Read the end of an output opened in binary mode by reading it to its end, for streams that cannot be seeked
+    without being read again, like decompressed outputs.
+
+    Args:
+        handle (BinaryIO): Output opened in binary mode
+        size (int): Number of bytes to read at most
+
+    Returns:
+        str: The end of the output, starting at a line boundary unless the whole output was read
+    """
+    tail = b''
+    truncated = False
+    for chunk in iter(lambda: handle.read(1 << 20), b''):
+        truncated = truncated or len(tail) + len(chunk) > size
+        tail = (tail + chunk)[-size:]
+    text = tail.decode('utf-8', errors='ignore')
+    if truncated:
+        text = text.partition('\n')[2]
+    return text
+
+
+def probe_tail(tail: str) -> t.Tuple[bool, t.Optional[str]]:
+    """Tell from the end of an output whether ORCA terminated normally or with a fatal error.
+
+    Args:
+        tail (str): End of the output, see ``read_tail``
+
+    Returns:
+        tuple: Whether ORCA terminated normally and, if it did not, the first line of the tail with a fatal error
+        message, or ``None`` if there is none, e.g. if the job was killed
+    """
+    if any(marker in tail for marker in NORMAL_TERMINATION):
+        return True, None
+    for line in tail.splitlines():
+        if any(message in line for message in FATAL_ERRORS):
+            return False, line.strip()
+    return False, None
+
+
+def classify_error(*texts: str) -> t.Optional[str]:
+    """Classify the failure of a calculation from the messages of ORCA.
+
+    Args:
+        texts (str): End of the output and other messages of ORCA, e.g. its warnings
+
+    Returns:
+        str: Name of the exit code of the first class of ``ERROR_MESSAGES`` with a message in the texts, or ``None``
+    """
+    text = '\n'.join(texts).lower()
+    for error, messages in ERROR_MESSAGES:
+        if any(message in text for message in messages):
+            return error
+    return None
+
+
+def killed_by_walltime(stderr: str) -> bool:
+    """Return whether the stderr of the scheduler tells that the job was killed when it ran out of walltime."""
+    stderr = stderr.lower()
+    return any(message in stderr for message in WALLTIME_MESSAGES)
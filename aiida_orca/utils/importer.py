@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""Bulk import of ORCA calculations run outside of AiiDA as ``OrcaCalculation`` nodes.
+
+The outputs are parsed with cclib in a pool of processes, see ``aiida_orca.parsers.export.parse_paths``. The inputs of
+each calculation, its ``structure`` and ``parameters``, are reconstructed from the echo of the input file in its output,
+and its output nodes are created from the parsed attributes by the ``OrcaBaseParser``, without parsing the output again.
+The nodes of many calculations are stored together in one transaction of the database.
+"""
+import os
+import typing as t
+
+from aiida.common import LinkType
+from aiida.common.log import AIIDA_LOGGER
+from aiida.orm import CalcJobNode, Dict, FolderData, StructureData
+
+LOGGER = AIIDA_LOGGER.getChild('orca.importer')
+
+#: Entry point of the ``OrcaCalculation``, which is the process type of the imported calculations.
+PROCESS_TYPE = 'aiida.calculations:orca.orca'
+
+#: Blocks of the input that are set on a single line, without an ``end``, and that ``render_orca_input`` cannot render.
+_SINGLE_LINE_BLOCKS = ('maxcore', 'moinp', 'base')
+
+
+def parse_input_file(contents: str) -> t.Tuple[dict, t.List[str]]:
+    """Reconstruct the ``parameters`` of an ``OrcaCalculation`` from the contents of an input file.
+
+    The keywords, the blocks with one setting per line and the charge and multiplicity of the coordinates are
+    reconstructed. Other lines, like those of nested blocks or single-line blocks such as ``%maxcore``, are returned
+    instead, since ``render_orca_input`` cannot render them.
+
+    Args:
+        contents (str): Contents of the input file, as echoed in the output of ORCA
+
+    Returns:
+        tuple: The parameters and the lines that are not part of them
+
+    Raises:
+        ValueError: If a block of the input has no name
+    """
+    parameters: t.Dict[str, t.Any] = {'input_keywords': []}
+    blocks: t.Dict[str, dict] = {}
+    skipped = []
+    block = None
+
+    for line in contents.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        words = line.split()
+
+        if block is not None:
+            if words[0].lower() == 'end':
+                block = None
+                continue
+            # The last setting of a block may be followed by its `end` on the same line, e.g. `maxiter 10 end`.
+            closed = words[-1].lower() == 'end'
+            if closed:
+                words = words[:-1]
+            if words[0] in block or line.startswith('{'):
+                skipped.append(line)
+            else:
+                block[words[0]] = ' '.join(words[1:]) or None
+            if closed:
+                block = None
+        elif line.startswith('!'):
+            parameters['input_keywords'] += line[1:].split()
+        elif line.startswith('%'):
+            if words[0] == '%' and len(words) < 2:
+                raise ValueError(f'the echo of the input has a block without a name: {line}')
+            name = words[0][1:].lower() or words[1].lower()
+            settings = words[1:] if words[0] != '%' else words[2:]
+            if name in _SINGLE_LINE_BLOCKS:
+                skipped.append(line)
+                continue
+            block = blocks.setdefault(name, {})
+            # Settings may follow the name of a block, which may be closed on the same line, e.g. `%pal nprocs 4 end`.
+            closed = bool(settings) and settings[-1].lower() == 'end'
+            if closed:
+                settings = settings[:-1]
+            for key, value in zip(settings[::2], settings[1::2]):
+                block[key] = value
+            if closed:
+                block = None
+        elif line.startswith('*'):
+            words = line[1:].split()
+            if len(words) >= 3:
+                parameters['charge'] = int(words[1])
+                parameters['multiplicity'] = int(words[2])
+            break
+        else:
+            skipped.append(line)
+
+    if blocks:
+        parameters['input_blocks'] = blocks
+    return parameters, skipped
+
+
+def get_inputs(parsed: dict) -> t.Tuple[StructureData, Dict, t.List[str]]:
+    """Reconstruct the inputs of a calculation from the attributes parsed from its output.
+
+    The structure is the first geometry of the output. The parameters are reconstructed from the echo of the input
+    file, see ``parse_input_file``, with the charge and multiplicity parsed from the output if the input has none.
+
+    Args:
+        parsed (dict): The parsed attributes
+
+    Returns:
+        tuple: The structure, the parameters and the lines of the input that are not part of the parameters
+
+    Raises:
+        ValueError: If the output has no geometry or its input has no keywords
+    """
+    import ase
+
+    metadata = parsed.get('metadata', {})
+    if parsed.get('atomcoords') is not None and parsed.get('atomnos') is not None:
+        atoms = ase.Atoms(numbers=parsed['atomnos'], positions=parsed['atomcoords'][0])
+    elif metadata.get('coord_type') == 'xyz' and metadata.get('coords'):
+        atoms = ase.Atoms(
+            symbols=[coord[0] for coord in metadata['coords']], positions=[coord[1:] for coord in metadata['coords']]
+        )
+    else:
+        raise ValueError('the output has no geometry')
+    # Temporary hack to support AiiDA 1.x, which needs default cell even for non-periodic structures.
+    atoms.set_cell([1.0, 1.0, 1.0])
+
+    parameters, skipped = parse_input_file(metadata.get('input_file_contents', ''))
+    if metadata.get('keywords'):
+        parameters['input_keywords'] = metadata['keywords']
+    if not parameters['input_keywords']:
+        raise ValueError('the output has no echo of the keywords of its input')
+    for key, attribute in (('charge', 'charge'), ('multiplicity', 'mult')):
+        if key not in parameters and parsed.get(attribute) is not None:
+            parameters[key] = int(parsed[attribute])
+
+    return StructureData(ase=atoms), Dict(dict=parameters), skipped
+
+
+def _get_retrieved(filepath: str) -> FolderData:
+    """Return the retrieved folder of an output, with the relaxed structure and the Hessian written next to it, which
+    are named after the input rather than the ``OrcaCalculation``."""
+    from aiida_orca.calculations import OrcaCalculation
+
+    # pylint: disable=protected-access
+    stem = os.path.splitext(filepath)[0]
+    retrieved = FolderData()
+    retrieved.put_object_from_file(filepath, OrcaCalculation._OUTPUT_FILE)
+    for extension, filename in (('.xyz', OrcaCalculation._RELAX_COORDS_FILE), ('.hess', OrcaCalculation._HESSIAN_FILE)):
+        if os.path.isfile(stem + extension):
+            retrieved.put_object_from_file(stem + extension, filename)
+    return retrieved
+
+
+def _add_incoming(target, source, link_type: LinkType, link_label: str) -> None:
+    """Link a node to the node it is an input or output of."""
+    # Change this when we drop AiiDA 1.x support
+    # target.base.links.add_incoming(source, link_type=link_type, link_label=link_label)
+    links = target.base.links if hasattr(target, 'base') else target
+    links.add_incoming(source, link_type=link_type, link_label=link_label)
+
+
+def create_calculation(filepath: str, parsed: dict, code=None) -> CalcJobNode:
+    """Store an ``OrcaCalculation`` node of an output, with its inputs and outputs.
+
+    Args:
+        filepath (str): Path of the output
+        parsed (dict): The attributes parsed from the output
+        code (Code): Code that ran the calculation, or ``None`` if it is unknown
+
+    Returns:
+        CalcJobNode: The stored node, finished with the exit status of the ``OrcaBaseParser``
+
+    Raises:
+        ValueError: If the inputs cannot be reconstructed, see ``get_inputs``
+    """
+    from aiida.engine import ProcessState
+
+    from aiida_orca.calculations import OrcaCalculation
+    from aiida_orca.parsers import OrcaBaseParser
+
+    structure, parameters, skipped = get_inputs(parsed)
+    if skipped:
+        LOGGER.warning(f'Lines of the input of {filepath} left out of the parameters: {"; ".join(skipped)}')
+
+    node = CalcJobNode(computer=code.computer if code is not None else None, process_type=PROCESS_TYPE)
+    node.set_process_label(OrcaCalculation.__name__)
+    node.set_option('parser_name', OrcaCalculation._PARSER)  # pylint: disable=protected-access
+    # Change this when we drop AiiDA 1.x support
+    # node.base.attributes.set(CalcJobNode.IMMIGRATED_KEY, True)
+    if hasattr(node, 'base'):
+        node.base.attributes.set('imported', True)
+    else:
+        node.set_attribute('imported', True)
+
+    inputs = {'structure': structure, 'parameters': parameters}
+    if code is not None:
+        inputs['code'] = code
+    for link_label, input_node in inputs.items():
+        input_node.store()
+        _add_incoming(node, input_node, LinkType.INPUT_CALC, link_label)
+    node.store()
+
+    retrieved = _get_retrieved(filepath)
+    _add_incoming(retrieved, node, LinkType.CREATE, 'retrieved')
+    retrieved.store()
+
+    # pylint: disable=protected-access
+    parser = OrcaBaseParser(node)
+    outputs, exit_code = parser._parse_retrieved(
+        OrcaCalculation._OUTPUT_FILE, OrcaCalculation._RELAX_COORDS_FILE, parsed_dict=parsed
+    )
+    for link_label, output_node in outputs.items():
+        _add_incoming(output_node, node, LinkType.CREATE, link_label)
+        output_node.store()
+
+    node.set_exit_status(exit_code.status)
+    node.set_exit_message(exit_code.message)
+    node.set_process_state(ProcessState.FINISHED)
+    node.seal()
+    return node
+
+
+def _transaction():
+    """Return a transaction of the storage of the loaded profile."""
+    from aiida.manage.manager import get_manager
+
+    manager = get_manager()
+    # Change this when we drop AiiDA 1.x support
+    # return manager.get_profile_storage().transaction()
+    backend = manager.get_profile_storage() if hasattr(manager, 'get_profile_storage') else manager.get_backend()
+    return backend.transaction()
+
+
+def import_outputs(paths: t.Sequence[str],
+                   code=None,
+                   group=None,
+                   max_workers: int = 1,
+                   batch_size: int = 100) -> t.Tuple[t.List[int], t.List[t.Tuple[str, str]]]:
+    """Import ORCA outputs as ``OrcaCalculation`` nodes.
+
+    The outputs are parsed by ``max_workers`` processes, while the nodes are created in this process and stored in
+    transactions of ``batch_size`` calculations. Outputs that cannot be parsed or whose inputs cannot be reconstructed
+    are skipped, before any of their nodes is stored, as are outputs whose nodes cannot be created, so that they do not
+    abort the import of the others.
+
+    Args:
+        paths (list): Paths of the outputs
+        code (Code): Code that ran the calculations, or ``None`` if it is unknown
+        group (Group): Group to which the calculations are added, or ``None``
+        max_workers (int): Number of processes that parse the outputs
+        batch_size (int): Number of calculations stored in one transaction
+
+    Returns:
+        tuple: The pks of the imported calculations, in the order of the paths, and the path and error of each output
+        that could not be imported
+    """
+    from aiida_orca.parsers.export import parse_paths
+
+    imported = []
+    failed = []
+    batch: t.List[t.Tuple[str, dict]] = []
+
+    def store_batch():
+        nodes = []
+        with _transaction():
+            for filepath, parsed in batch:
+                try:
+                    nodes.append(create_calculation(filepath, parsed, code))
+                except Exception as exception:  # pylint: disable=broad-except
+                    failed.append((filepath, f'{type(exception).__name__}: {exception}'))
+            if group is not None and nodes:
+                group.add_nodes(nodes)
+        imported.extend(node.pk for node in nodes)
+        batch.clear()
+
+    for filepath, parsed, error in parse_paths(paths, {}, max_workers):
+        if error is not None:
+            failed.append((filepath, error))
+            continue
+        batch.append((filepath, parsed))
+        if len(batch) >= batch_size:
+            store_batch()
+    if batch:
+        store_batch()
+
+    return imported, failed
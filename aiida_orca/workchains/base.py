@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 """Base work chain to run an ORCA calculation"""
+import re
 
 from aiida.common import AttributeDict
 from aiida.engine import BaseRestartWorkChain, ProcessHandlerReport, process_handler, while_
-from aiida.plugins import CalculationFactory
+from aiida.orm import Dict, Float, to_aiida_type
 
-OrcaCalculation = CalculationFactory('orca.orca')
+# Imported directly rather than with the `CalculationFactory`, which loads the entry points when the module is imported.
+from aiida_orca.calculations import OrcaCalculation
 
 
 class OrcaBaseWorkChain(BaseRestartWorkChain):
@@ -13,10 +15,42 @@ class OrcaBaseWorkChain(BaseRestartWorkChain):
 
     _process_class = OrcaCalculation
 
+    # Settings merged into `input_blocks['scf']` one after the other, each time the SCF does not converge.
+    _SCF_ESCALATION = (
+        {
+            'maxiter': 250
+        },
+        {
+            'maxiter': 500,
+            'diismaxeq': 15,
+            'directresetfreq': 1
+        },
+        {
+            'maxiter': 1000,
+            'diismaxeq': 15,
+            'directresetfreq': 1,
+            'shift': 'shift 0.1 erroff 0.1 end'
+        },
+    )
+
+    # Maximum number of cycles of a geometry optimization when `input_blocks['geom']` does not set `maxiter`.
+    _OPTIMIZATION_MAX_CYCLES = 50
+
+    # Keywords of geometry optimizations, e.g. `Opt`, `TightOpt`, `COpt`, `OptTS` or `OptH`.
+    _OPTIMIZATION_KEYWORD = re.compile(r'^[\w-]*opt(ts|h)?$', re.IGNORECASE)
+
     @classmethod
     def define(cls, spec):
         super().define(spec)
         spec.expose_inputs(OrcaCalculation, namespace='orca')
+        spec.input(
+            'walltime_factor',
+            valid_type=Float,
+            required=False,
+            serializer=to_aiida_type,
+            help='Factor by which `max_wallclock_seconds` is multiplied when a calculation that ran out of walltime is '
+            'restarted. By default, the walltime is kept.'
+        )
         spec.outline(
             cls.setup,
             while_(cls.should_run_process)(
@@ -36,6 +70,21 @@ class OrcaBaseWorkChain(BaseRestartWorkChain):
             'ERROR_AIIDA_ORCA_UNRECOVERABLE_FAILURE',
             message='The calculation failed with an unrecoverable error coming from aiida-orca.'
         )
+        spec.exit_code(
+            310,
+            'ERROR_SCF_NOT_CONVERGED',
+            message='The SCF did not converge, not even with the most robust SCF settings tried.'
+        )
+        spec.exit_code(
+            320,
+            'ERROR_OPTIMIZATION_NOT_CONVERGED',
+            message='The optimization did not converge within the maximum number of cycles.'
+        )
+        spec.exit_code(
+            330,
+            'ERROR_INSUFFICIENT_MEMORY',
+            message='ORCA ran out of memory, the MaxCore setting or the memory of the job should be increased.'
+        )
 
     def setup(self):
         """Call the `setup` of the `BaseRestartWorkChain` and then create the inputs dictionary in `self.ctx.inputs`.
@@ -44,6 +93,7 @@ class OrcaBaseWorkChain(BaseRestartWorkChain):
 
         super().setup()
         self.ctx.inputs = AttributeDict(self.exposed_inputs(OrcaCalculation, 'orca'))
+        self.ctx.scf_escalation = 0
 
     def report_error_handled(self, calculation, action):
         """Report an action taken for a calculation that has failed.
@@ -57,6 +107,207 @@ class OrcaBaseWorkChain(BaseRestartWorkChain):
         )
         self.report(f'Action taken: {action}')
 
+    def set_orbitals_guess(self, calculation, parameters):
+        """Use the orbitals of a calculation, in its remote working directory, as the initial guess of the next one.
+
+        :param calculation: the calculation node whose orbitals to use
+        :param parameters: the dictionary of the input parameters of the next calculation, updated in place
+        :return: whether the calculation has a remote working directory
+        """
+        if 'remote_folder' not in calculation.outputs:
+            return False
+
+        # The `gbw` file of the parent calculation is linked to `aiida_old.gbw`, in place of a `gbw` input file.
+        gbw_file = OrcaCalculation._OLD_GBW_FILE  # pylint: disable=protected-access
+        self.ctx.inputs.parent_calc_folder = calculation.outputs.remote_folder
+        self.ctx.inputs.get('file', {}).pop('gbw', None)
+        parameters.setdefault('input_blocks', {}).setdefault('scf', {})['moinp'] = f'"{gbw_file}"'
+        keywords = parameters.get('input_keywords', []) + parameters.get('extra_input_keywords', [])
+        if 'moread' not in [keyword.lower() for keyword in keywords]:
+            parameters['extra_input_keywords'] = parameters.get('extra_input_keywords', []) + ['MOREAD']
+
+        return True
+
+    def get_last_geometry(self, calculation):
+        """Return the structure of the last geometry of a calculation, with the coordinates parsed from its output.
+
+        :param calculation: the calculation node
+        :return: a new structure with the sites of the input structure at the last positions, or ``None`` if the
+            calculation did not reach a geometry
+        """
+        positions = None
+        if 'output_parameters' in calculation.outputs:
+            output_parameters = calculation.outputs.output_parameters.get_dict()
+            arrays = output_parameters.get('arrays', {})
+            if 'atomcoords' in arrays and 'output_arrays' in calculation.outputs:
+                positions = calculation.outputs.output_arrays.get_array(arrays['atomcoords'])[-1]
+            elif output_parameters.get('atomcoords'):
+                positions = output_parameters['atomcoords'][-1]
+
+        structure = self.ctx.inputs.structure
+        if positions is None or len(positions) != len(structure.sites):
+            return None
+
+        structure = structure.clone()
+        structure.reset_sites_positions([list(map(float, position)) for position in positions])
+        return structure
+
+    @staticmethod
+    def get_completed_cycles(calculation):
+        """Return the number of cycles of an optimization that a calculation completed, from its parsed `geovalues`.
+
+        :param calculation: the calculation node of the optimization
+        """
+        if 'output_parameters' not in calculation.outputs:
+            return 0
+        output_parameters = calculation.outputs.output_parameters.get_dict()
+        arrays = output_parameters.get('arrays', {})
+        if 'geovalues' in arrays and 'output_arrays' in calculation.outputs:
+            return len(calculation.outputs.output_arrays.get_array(arrays['geovalues']))
+        return len(output_parameters.get('geovalues') or [])
+
+    def is_optimization(self, calculation, parameters):
+        """Return whether a calculation is a geometry optimization, from an `Opt` keyword of its input, e.g. `TightOpt`
+        or `OptTS`, or the cycles of an optimization that it completed.
+
+        :param calculation: the calculation node
+        :param parameters: the dictionary of the input parameters of the calculation
+        """
+        keywords = parameters.get('input_keywords', []) + parameters.get('extra_input_keywords', [])
+        if any(self._OPTIMIZATION_KEYWORD.match(keyword) for keyword in keywords):
+            return True
+        return self.get_completed_cycles(calculation) > 0
+
+    def get_remaining_cycles(self, calculation, parameters):
+        """Return the number of cycles of an optimization left after a calculation, from the `maxiter` of the `geom`
+        input block and the cycles that the calculation completed.
+
+        :param calculation: the calculation node of the optimization
+        :param parameters: the dictionary of the input parameters of the calculation
+        """
+        max_cycles = self._OPTIMIZATION_MAX_CYCLES
+        for block, settings in parameters.get('input_blocks', {}).items():
+            if block.lower() == 'geom':
+                max_cycles = next((value for key, value in settings.items() if key.lower() == 'maxiter'), max_cycles)
+
+        return int(max_cycles) - self.get_completed_cycles(calculation)
+
+    def set_hessian_guess(self, calculation, parameters):
+        """Use the Hessian of a calculation as the initial Hessian of the next optimization, if it wrote one.
+
+        :param calculation: the calculation node whose Hessian to use
+        :param parameters: the dictionary of the input parameters of the next calculation, updated in place
+        :return: whether the Hessian was retrieved, which tells that it is in the remote working directory
+        """
+        # pylint: disable=protected-access
+        if 'remote_folder' not in calculation.outputs:
+            return False
+        if OrcaCalculation._HESSIAN_FILE not in calculation.outputs.retrieved.list_object_names():
+            return False
+
+        # The Hessian of the parent calculation is linked under another name, so that the optimization does not
+        # overwrite it.
+        self.ctx.inputs.parent_calc_folder = calculation.outputs.remote_folder
+        geom = parameters.setdefault('input_blocks', {}).setdefault('geom', {})
+        geom.update({'inhess': 'read', 'inhessname': f'"{OrcaCalculation._OLD_HESSIAN_FILE}"'})
+
+        return True
+
+    @process_handler(priority=410, exit_codes=[OrcaCalculation.exit_codes.ERROR_SCF_NOT_CONVERGED])  # pylint: disable=no-member
+    def handle_scf_not_converged(self, calculation):
+        """Handle the SCF not converging.
+
+           Restart from the orbitals of the failed calculation with the next, more robust, SCF settings.
+        """
+        if self.ctx.scf_escalation >= len(self._SCF_ESCALATION):
+            self.report_error_handled(calculation, 'the most robust SCF settings were already tried, aborting...')
+            return ProcessHandlerReport(True, self.exit_codes.ERROR_SCF_NOT_CONVERGED)  # pylint: disable=no-member
+
+        settings = self._SCF_ESCALATION[self.ctx.scf_escalation]
+        self.ctx.scf_escalation += 1
+
+        parameters = self.ctx.inputs.parameters.get_dict()
+        parameters.setdefault('input_blocks', {}).setdefault('scf', {}).update(settings)
+        action = f'restarting with the SCF settings {settings}'
+        if self.set_orbitals_guess(calculation, parameters):
+            action += ' from the orbitals of the failed calculation'
+        self.ctx.inputs.parameters = Dict(dict=parameters)
+
+        self.report_error_handled(calculation, action)
+        return ProcessHandlerReport(True)
+
+    @process_handler(priority=400, exit_codes=[OrcaCalculation.exit_codes.ERROR_OUT_OF_WALLTIME])  # pylint: disable=no-member
+    def handle_out_of_walltime(self, calculation):
+        """Handle the calculation running out of walltime.
+
+           Restart from the orbitals of the killed calculation, with a longer walltime if `walltime_factor` is given.
+           Optimizations continue from their last geometry and Hessian for the cycles they have left.
+        """
+        parameters = self.ctx.inputs.parameters.get_dict()
+        actions = []
+
+        structure = self.get_last_geometry(calculation) if self.is_optimization(calculation, parameters) else None
+        if structure is not None:
+            remaining_cycles = self.get_remaining_cycles(calculation, parameters)
+            if remaining_cycles <= 0:
+                self.report_error_handled(calculation, 'no cycles of the optimization are left, aborting...')
+                return ProcessHandlerReport(True, self.exit_codes.ERROR_OPTIMIZATION_NOT_CONVERGED)  # pylint: disable=no-member
+
+            self.ctx.inputs.structure = structure
+            parameters.setdefault('input_blocks', {}).setdefault('geom', {})['maxiter'] = remaining_cycles
+            actions.append(f'continuing the optimization from its last geometry for {remaining_cycles} cycles')
+            if self.set_hessian_guess(calculation, parameters):
+                actions.append('from its Hessian')
+
+        if self.set_orbitals_guess(calculation, parameters):
+            actions.append('from the orbitals of the killed calculation')
+        self.ctx.inputs.parameters = Dict(dict=parameters)
+
+        if 'walltime_factor' in self.inputs:
+            options = self.ctx.inputs.metadata.options
+            if options.get('max_wallclock_seconds') is None:
+                actions.append('with the default walltime of the scheduler, since `max_wallclock_seconds` is not set')
+            else:
+                walltime = int(options['max_wallclock_seconds'] * self.inputs.walltime_factor.value)
+                options['max_wallclock_seconds'] = walltime
+                actions.append(f'with a walltime of {walltime} seconds')
+
+        self.report_error_handled(calculation, ' '.join(['restarting'] + actions))
+        return ProcessHandlerReport(True)
+
+    @process_handler(priority=500, exit_codes=[OrcaCalculation.exit_codes.ERROR_OPTIMIZATION_NOT_CONVERGED])  # pylint: disable=no-member
+    def handle_optimization_not_converged(self, calculation):
+        """Handle the optimization not converging within its maximum number of cycles.
+
+           Continue from the last geometry, Hessian and orbitals of the optimization for as many cycles again.
+        """
+        parameters = self.ctx.inputs.parameters.get_dict()
+        structure = self.get_last_geometry(calculation)
+        if structure is None:
+            self.report_error_handled(calculation, 'the optimization did not reach a geometry, aborting...')
+            return ProcessHandlerReport(True, self.exit_codes.ERROR_OPTIMIZATION_NOT_CONVERGED)  # pylint: disable=no-member
+
+        self.ctx.inputs.structure = structure
+        actions = ['continuing the optimization from its last geometry']
+        if self.set_hessian_guess(calculation, parameters):
+            actions.append('from its Hessian')
+        if self.set_orbitals_guess(calculation, parameters):
+            actions.append('from its orbitals')
+        self.ctx.inputs.parameters = Dict(dict=parameters)
+
+        self.report_error_handled(calculation, ' '.join(actions))
+        return ProcessHandlerReport(True)
+
+    @process_handler(priority=420, exit_codes=[OrcaCalculation.exit_codes.ERROR_INSUFFICIENT_MEMORY])  # pylint: disable=no-member
+    def handle_insufficient_memory(self, calculation):
+        """Handle ORCA running out of memory.
+
+           The memory per core is set by `%maxcore`, which the input parameters cannot set, so abort rather than
+           rerun the calculation with the same memory.
+        """
+        self.report_error_handled(calculation, 'the memory of the calculation should be increased, aborting...')
+        return ProcessHandlerReport(True, self.exit_codes.ERROR_INSUFFICIENT_MEMORY)  # pylint: disable=no-member
+
     @process_handler()
     def handle_known_unrecoverable_failure(self, calculation):
         """Handle exit status between 300-399.
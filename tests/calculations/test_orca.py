@@ -3,7 +3,7 @@
 import io
 
 from aiida.common import datastructures
-from aiida.orm import SinglefileData
+from aiida.orm import RemoteData, SinglefileData, StructureData
 
 from aiida_orca.calculations.orca_orca import OrcaCalculation
 
@@ -57,3 +57,73 @@ def test_file_gbw(generate_calc_job, generate_inputs_orca):
     inputs = generate_inputs_orca({'file': {'gbw': single_file}})
     calc_info, _ = generate_calc_job(entry_point_name, inputs)
     assert calc_info.local_copy_list == [(single_file.uuid, single_file.filename, 'aiida_old.gbw')]
+
+
+def test_parent_calc_folder(generate_calc_job, generate_inputs_orca, aiida_localhost):
+    """Test the ``parent_calc_folder`` input.
+
+    The gbw and hessian files of the parent calculation are symlinked, unless a file of the ``file`` namespace takes
+    their place.
+    """
+    entry_point_name = 'orca.orca'
+
+    parent_calc_folder = RemoteData(computer=aiida_localhost, remote_path='/scratch/parent')
+    inputs = generate_inputs_orca({'parent_calc_folder': parent_calc_folder})
+    calc_info, _ = generate_calc_job(entry_point_name, inputs)
+    assert calc_info.remote_symlink_list == [
+        (aiida_localhost.uuid, '/scratch/parent/aiida.gbw', 'aiida_old.gbw'),
+        (aiida_localhost.uuid, '/scratch/parent/aiida.hess', 'aiida_old.hess'),
+    ]
+    assert not calc_info.remote_copy_list
+
+    single_file = SinglefileData(io.BytesIO(b'content'), filename='file.gbw')
+    inputs = generate_inputs_orca({
+        'parent_calc_folder': parent_calc_folder,
+        'file': {
+            'gbw': single_file
+        },
+        'metadata': {
+            'options': {
+                'parent_folder_symlink': False
+            }
+        },
+    })
+    calc_info, _ = generate_calc_job(entry_point_name, inputs)
+    assert calc_info.remote_copy_list == [(aiida_localhost.uuid, '/scratch/parent/aiida.hess', 'aiida_old.hess')]
+    assert not calc_info.remote_symlink_list
+
+
+def test_write_structure(fixture_sandbox):
+    """Test that the structure is written as by the plain ``extxyz`` writer of ASE."""
+    from ase.build import molecule
+
+    atoms = molecule('CH3CH2OH', vacuum=5.0)
+    atoms.positions[0] *= -123.456
+    structure = StructureData(ase=atoms)
+
+    OrcaCalculation._write_structure(structure, fixture_sandbox, 'native.xyz')  # pylint: disable=protected-access
+    atoms.write(fixture_sandbox.get_abs_path('ase.xyz'), format='extxyz', plain=True)
+
+    with fixture_sandbox.open('native.xyz') as native, fixture_sandbox.open('ase.xyz') as ase:
+        assert native.read() == ase.read()
+
+
+def test_compress_output(generate_calc_job, generate_inputs_orca):
+    """Test that the output is compressed after ORCA ends and retrieved whether or not it was compressed."""
+    inputs = generate_inputs_orca()
+    inputs['metadata']['options']['compress_output'] = 'xz'
+    calc_info, _ = generate_calc_job('orca.orca', inputs)
+
+    assert calc_info.append_text == 'xz -f aiida.out'
+    assert calc_info.retrieve_list == ['aiida.out', 'aiida.hess', 'aiida.xyz', 'aiida.out.xz']
+
+
+def test_temporary_files(generate_calc_job, generate_inputs_orca):
+    """Test that the temporary files, with their compressed variants, are moved to the retrieve temporary list."""
+    inputs = generate_inputs_orca()
+    inputs['metadata']['options']['compress_output'] = 'gzip'
+    inputs['metadata']['options']['temporary_files'] = ['aiida.out', 'aiida.hess']
+    calc_info, _ = generate_calc_job('orca.orca', inputs)
+
+    assert calc_info.retrieve_list == ['aiida.xyz']
+    assert calc_info.retrieve_temporary_list == ['aiida.out', 'aiida.hess', 'aiida.out.gz']
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Tests for the :class:`aiida_orca.calculations.orca_batch.OrcaBatchCalculation` plugin."""
+import pytest
+
+from aiida.orm import Dict
+
+from aiida_orca.calculations.orca_batch import OrcaBatchCalculation
+
+
+@pytest.fixture
+def generate_inputs_orca_batch(generate_inputs_orca, generate_structure):
+    """Generate inputs for an ``OrcaBatchCalculation`` of two items, one with parameters of its own."""
+
+    def factory():
+        inputs = generate_inputs_orca()
+        del inputs['structure']
+        inputs['structures'] = {'first': generate_structure, 'second': generate_structure.clone()}
+        inputs['item_parameters'] = {'second': Dict(dict=dict(inputs['parameters'].get_dict(), multiplicity=3))}
+        inputs['metadata']['options']['max_concurrent'] = 2
+        return inputs
+
+    return factory
+
+
+def test_default(generate_calc_job, generate_inputs_orca_batch):
+    """Test a default ``OrcaBatchCalculation``."""
+    inputs = generate_inputs_orca_batch()
+    calc_info, dirpath = generate_calc_job('orca.batch', inputs)
+
+    # pylint: disable=protected-access
+    assert sorted(dirpath.get_content_list()) == [OrcaBatchCalculation._DRIVER_FILE, 'first', 'second']
+    for item in ('first', 'second'):
+        subfolder = dirpath.get_subfolder(item)
+        assert sorted(subfolder.get_content_list()) == ['aiida.coords.xyz', 'aiida.inp']
+        for filename in ('aiida.out', 'aiida.hess', 'aiida.xyz'):
+            assert (f'{item}/{filename}', '.', 2) in calc_info.retrieve_list
+
+    with dirpath.get_subfolder('first').open('aiida.inp') as handle:
+        assert '* xyzfile 0 1 aiida.coords.xyz' in handle.read()
+    with dirpath.get_subfolder('second').open('aiida.inp') as handle:
+        assert '* xyzfile 0 3 aiida.coords.xyz' in handle.read()
+
+    with dirpath.open(OrcaBatchCalculation._DRIVER_FILE) as handle:
+        driver = handle.read()
+    assert 'for item in first second; do' in driver
+    assert '-ge 2 ]' in driver
+    assert calc_info.codes_info == []
+    assert calc_info.append_text == f'bash {OrcaBatchCalculation._DRIVER_FILE}'
+
+
+def test_missing_parameters(generate_calc_job, generate_inputs_orca_batch):
+    """Test that every item needs parameters, shared or of its own."""
+    inputs = generate_inputs_orca_batch()
+    del inputs['parameters']
+
+    with pytest.raises(ValueError, match='Neither `parameters` nor `item_parameters` are given for the items: first'):
+        generate_calc_job('orca.batch', inputs)
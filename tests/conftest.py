@@ -196,3 +196,74 @@ def generate_inputs_orca(aiida_local_code_factory, generate_structure):
         return base_inputs
 
     return factory
+
+
+@pytest.fixture
+def generate_workchain():
+    """Generate an instance of a ``WorkChain``."""
+
+    def _generate_workchain(entry_point, inputs):
+        """Generate an instance of a ``WorkChain`` with the given entry point and inputs.
+
+        :param entry_point: entry point name of the work chain subclass.
+        :param inputs: inputs to be passed to process construction.
+        :return: a ``WorkChain`` instance.
+        """
+        from aiida.engine.utils import instantiate_process
+        from aiida.manage.manager import get_manager
+        from aiida.plugins import WorkflowFactory
+
+        process_class = WorkflowFactory(entry_point)
+        runner = get_manager().get_runner()
+        process = instantiate_process(runner, process_class, **inputs)
+
+        return process
+
+    return _generate_workchain
+
+
+@pytest.fixture
+def generate_workchain_orca_base(generate_workchain, generate_inputs_orca, generate_calc_job_node, aiida_localhost):
+    """Generate an instance of an ``OrcaBaseWorkChain``, set up, with optionally a failed calculation to handle."""
+
+    def _generate_workchain_orca_base(exit_code=None, retrieved=None, outputs=None, inputs=None):
+        """Generate an instance of an ``OrcaBaseWorkChain``.
+
+        :param exit_code: exit code of the failed ``OrcaCalculation`` set as the last calculation of the work chain.
+        :param retrieved: dictionary of the names and contents of the files retrieved by the failed calculation.
+        :param outputs: dictionary of the link labels and nodes of the other outputs of the failed calculation.
+        :param inputs: inputs of the work chain other than those of the ``orca`` namespace.
+        :return: an ``OrcaBaseWorkChain`` instance.
+        """
+        import io
+
+        from aiida import orm
+        from aiida.common import LinkType
+
+        process = generate_workchain('orca.base', {'orca': generate_inputs_orca(), **(inputs or {})})
+        process.setup()
+
+        if exit_code is not None:
+            node = generate_calc_job_node('orca.orca', aiida_localhost, inputs=generate_inputs_orca())
+            node.set_process_state('finished')
+            node.set_exit_status(exit_code.status)
+
+            folder = orm.FolderData()
+            for filename, content in (retrieved or {}).items():
+                folder.put_object_from_filelike(io.BytesIO(content), filename)
+            folder.add_incoming(node, link_type=LinkType.CREATE, link_label='retrieved')
+            folder.store()
+
+            remote_folder = orm.RemoteData(computer=aiida_localhost, remote_path='/tmp')
+            remote_folder.add_incoming(node, link_type=LinkType.CREATE, link_label='remote_folder')
+            remote_folder.store()
+
+            for link_label, output in (outputs or {}).items():
+                output.add_incoming(node, link_type=LinkType.CREATE, link_label=link_label)
+                output.store()
+
+            process.ctx.children = [node]
+
+        return process
+
+    return _generate_workchain_orca_base
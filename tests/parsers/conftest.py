@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""Fixtures for the parser tests."""
+import pytest
+
+from .synthetic_output import write_orca_output
+
+
+@pytest.fixture
+def generate_orca_output(tmp_path):
+    """Return a factory writing a synthetic ORCA output to a temporary file, see :func:`write_orca_output`."""
+
+    def factory(filename='aiida.out', **kwargs):
+        """Write a synthetic ORCA output and return its path.
+
+        :param filename: name of the output file in the temporary directory
+        :param kwargs: parameters of the output, passed to :func:`write_orca_output`
+        :return: the path of the output file
+        """
+        filepath = tmp_path / filename
+        with open(filepath, 'w', encoding='utf-8') as handle:
+            write_orca_output(handle, **kwargs)
+        return filepath
+
+    return factory
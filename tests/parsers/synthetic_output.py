@@ -0,0 +1,452 @@
+# -*- coding: utf-8 -*-
+"""Generator of synthetic ORCA outputs for benchmarking and regression-testing the parser at scale.
+
+The outputs follow the layout of ORCA 4 and 5 closely enough for every section to be picked up by
+:class:`aiida_orca.parsers.cclib.orcaparser.ORCA`, but the numbers in them carry no physical meaning.
+They are written line by line to a handle, so that outputs far larger than the fixtures never have to
+be held in memory.
+"""
+import io
+import random
+
+ELEMENTS = [('C', 6, 12.011), ('H', 1, 1.008), ('H', 1, 1.008), ('O', 8, 15.999), ('H', 1, 1.008), ('N', 7, 14.007)]
+ORBITALS = ['1s', '2s', '1pz', '1px', '1py', '3s', '2pz', '2px', '2py', '1dz2', '1dxz', '1dyz', '1dx2y2', '1dxy']
+BOHR = 1.8897261246
+
+DASHES = '-' * 80
+
+
+def _banner(title):
+    """Return a title underlined and overlined with dashes, as ORCA prints its section titles."""
+    dashes = '-' * len(title)
+    return f'{dashes}\n{title}\n{dashes}\n'
+
+
+class _SyntheticOutput:
+    """Write the sections of a synthetic ORCA output to a handle."""
+
+    def __init__(self, handle, natom, nbasis, opt_cycles, tddft_roots, print_mos, print_overlap, freq, version, seed):
+        # pylint: disable=too-many-arguments
+        self.handle = handle
+        self.random = random.Random(seed)
+        self.version = version
+        self.major = int(version.split('.')[0])
+
+        self.natom = natom
+        self.elements = [ELEMENTS[i % len(ELEMENTS)] for i in range(natom)]
+        nelectrons = sum(element[1] for element in self.elements)
+        # Keep the molecule closed shell by making it a cation if needed.
+        self.charge = nelectrons % 2
+        self.nocc = (nelectrons - self.charge) // 2
+        self.nbasis = nbasis or max(2 * self.nocc, 5 * natom)
+        if self.nbasis <= self.nocc:
+            raise ValueError(f'nbasis should be larger than the {self.nocc} occupied orbitals')
+
+        self.opt_cycles = opt_cycles
+        self.tddft_roots = tddft_roots
+        self.print_mos = print_mos
+        self.print_overlap = print_overlap
+        self.freq = freq
+
+        self.coords = [[
+            1.5 * (i % 4) + self.random.uniform(-0.1, 0.1),
+            1.5 * (i // 4 % 4) + self.random.uniform(-0.1, 0.1),
+            1.5 * (i // 16) + self.random.uniform(-0.1, 0.1),
+        ] for i in range(natom)]
+        self.energy = -40.0 * natom
+
+    def write(self, text):
+        self.handle.write(text)
+
+    def generate(self):
+        """Write the whole output."""
+        self.header()
+        self.input_file()
+        if self.opt_cycles:
+            self.optimization_settings()
+            for cycle in range(1, self.opt_cycles + 1):
+                self.optimization_cycle(cycle)
+            self.write_stationary_point()
+        self.single_point(first=not self.opt_cycles)
+        if self.freq:
+            self.frequencies()
+        self.footer()
+
+    def header(self):
+        self.write('\n                                 *****************\n')
+        self.write('                                 * O   R   C   A *\n')
+        self.write('                                 *****************\n\n')
+        self.write(f'                         Program Version {self.version} -  RELEASE  -\n\n\n')
+
+    def input_file(self):
+        """Write the echo of the input file."""
+        keywords = ['PBE', 'def2-SVP']
+        if self.opt_cycles:
+            keywords.append('Opt')
+        if self.freq:
+            keywords.append('Freq')
+        if self.print_mos:
+            keywords.append('PrintMOs')
+        lines = ['### Generated by AiiDA-ORCA Plugin ###', f'! {" ".join(keywords)}']
+        if self.print_overlap:
+            lines += ['%output', '\tprint[p_overlap] 1', 'end']
+        if self.tddft_roots:
+            lines += ['%tddft', '\ttda true', f'\tnroots {self.tddft_roots}', 'end']
+        lines += ['', f'* xyzfile {self.charge} 1 aiida.coords.xyz', '']
+
+        self.write('=' * 80 + '\n')
+        self.write('                                       INPUT FILE\n')
+        self.write('=' * 80 + '\n')
+        self.write('NAME = aiida.inp\n')
+        for number, line in enumerate(lines, 1):
+            self.write(f'|{number:3d}> {line}\n')
+        self.write(f'|{len(lines) + 1:3d}>                          ****END OF INPUT****\n')
+        self.write('=' * 80 + '\n\n')
+
+    def optimization_settings(self):
+        """Write the settings of the geometry optimization, holding the convergence targets."""
+        self.write('                       *****************************\n')
+        self.write('                       * Geometry Optimization Run *\n')
+        self.write('                       *****************************\n\n')
+        self.write('Geometry optimization settings:\n')
+        self.write('Update method            Update   .... BFGS\n\n')
+        self.write('Convergence Tolerances:\n')
+        self.write('Energy Change            TolE     ....  5.0000e-06 Eh\n')
+        self.write('Max. Gradient            TolMAXG  ....  3.0000e-04 Eh/bohr\n')
+        self.write('RMS Gradient             TolRMSG  ....  1.0000e-04 Eh/bohr\n')
+        self.write('Max. Displacement        TolMAXD  ....  4.0000e-03 bohr\n')
+        self.write('RMS Displacement         TolRMSD  ....  2.0000e-03 bohr\n')
+        self.write('Strict Convergence                ....  False\n\n')
+        self.write(f'Number of atoms                         .... {self.natom}\n\n')
+
+    def optimization_cycle(self, cycle):
+        """Write a cycle of the geometry optimization: energy, gradient and convergence."""
+        self.write('         *************************************************************\n')
+        self.write(f'         *                GEOMETRY OPTIMIZATION CYCLE {cycle:3d}            *\n')
+        self.write('         *************************************************************\n')
+        self.single_point(first=cycle == 1, optimization=True)
+        self.gradient()
+        self.geometry_convergence(cycle)
+        for coord in self.coords:
+            for axis in range(3):
+                coord[axis] += self.random.uniform(-0.01, 0.01) / cycle
+        self.energy -= 0.01 / cycle
+
+    def single_point(self, first=True, optimization=False):
+        """Write the coordinates, the SCF and, unless in an intermediate optimization cycle, the properties."""
+        self.coordinates()
+        if first:
+            self.basis_set_information()
+        self.scf(first)
+        if optimization and not first:
+            return
+        self.orbital_energies()
+        if self.print_mos:
+            self.molecular_orbitals()
+        self.charges()
+        if optimization:
+            return
+        if self.tddft_roots:
+            self.tddft()
+        self.dipole_moment()
+
+    def coordinates(self):
+        self.write(_banner('CARTESIAN COORDINATES (ANGSTROEM)'))
+        for (symbol, _, _), (x, y, z) in zip(self.elements, self.coords):
+            self.write(f'  {symbol:<2s}  {x:12.6f}{y:12.6f}{z:12.6f}\n')
+        self.write('\n')
+        self.write(_banner('CARTESIAN COORDINATES (A.U.)'))
+        self.write('  NO LB      ZA    FRAG     MASS         X           Y           Z\n')
+        for i, ((symbol, number, mass), (x, y, z)) in enumerate(zip(self.elements, self.coords)):
+            self.write(
+                f'{i:4d} {symbol:<2s}  {number:7.4f}    0  {mass:7.3f}'
+                f'{x * BOHR:12.6f}{y * BOHR:12.6f}{z * BOHR:12.6f}\n'
+            )
+        self.write('\n')
+
+    def basis_set_information(self):
+        """Write which basis set group each atom belongs to."""
+        symbols = sorted({symbol for symbol, _, _ in self.elements})
+        self.write(_banner('BASIS SET INFORMATION'))
+        self.write(f'There are {len(symbols)} groups of distinct atoms\n\n')
+        for group, symbol in enumerate(symbols, 1):
+            self.write(f' Group {group:3d} Type {symbol:<2s}  : 3s contracted to 1s pattern {{3}}\n')
+        self.write('\n')
+        for i, (symbol, _, _) in enumerate(self.elements):
+            self.write(f'Atom {i:3d}{symbol:<2s}   basis set group => {symbols.index(symbol) + 1:3d}\n')
+        self.write(DASHES + '\n\n')
+
+    def scf(self, first=True):
+        """Write the SCF settings, the overlap matrix if requested, the iterations and the converged energy."""
+        self.write(f'Number of atoms                             ... {self.natom:6d}\n')
+        self.write(f'Number of basis functions                   ... {self.nbasis:6d}\n\n')
+        self.write('General Settings:\n')
+        self.write(' Hartree-Fock type      HFTyp           .... RHF\n')
+        self.write(f' Total Charge           Charge          .... {self.charge:4d}\n')
+        self.write(' Multiplicity           Mult            ....    1\n')
+        self.write(f' Number of Electrons    NEL             .... {2 * self.nocc:4d}\n')
+        self.write(f' Basis Dimension        Dim             .... {self.nbasis:4d}\n\n')
+
+        if first and self.print_overlap:
+            self.write(_banner('OVERLAP MATRIX'))
+            self.block_matrix(self.nbasis, self.nbasis, lambda i, j: 1.0 if i == j else 0.1 / (1 + abs(i - j)))
+            self.write('\n')
+
+        self.write(_banner('SCF ITERATIONS'))
+        self.write('ITER       Energy         Delta-E        Max-DP      RMS-DP      [F,P]     Damp\n')
+        self.write('               ***  Starting incremental Fock matrix formation  ***\n')
+        niter = 8
+        previous = self.energy + 0.5
+        for iteration in range(niter):
+            energy = self.energy + 0.5 / 4**(iteration + 1)
+            delta = 0.0 if iteration == 0 else energy - previous
+            previous = energy
+            self.write(
+                f'{iteration:3d}   {energy:15.10f}  {delta:15.12f} {0.1 / 4**iteration:10.8f}  '
+                f'{0.01 / 4**iteration:10.8f}  {0.1 / 4**iteration:9.7f} 0.7000\n'
+            )
+        self.write('\n')
+        self.write('               *****************************************************\n')
+        self.write('               *                     SUCCESS                       *\n')
+        self.write(f'               *           SCF CONVERGED AFTER {niter:3d} CYCLES          *\n')
+        self.write('               *****************************************************\n\n')
+        self.write(_banner('TOTAL SCF ENERGY'))
+        self.write(f'\nTotal Energy       :     {self.energy:17.8f} Eh     {self.energy * 27.21138505:17.5f} eV\n\n')
+        self.write(_banner('SCF CONVERGENCE'))
+        self.write('\n  Last Energy change         ...   -4.1323e-09  Tolerance :   1.0000e-08\n')
+        self.write('  Last MAX-Density change    ...    2.3905e-08  Tolerance :   1.0000e-07\n')
+        self.write('  Last RMS-Density change    ...    3.0822e-09  Tolerance :   5.0000e-09\n\n')
+
+    def orbital_energies(self):
+        self.write(_banner('ORBITAL ENERGIES'))
+        self.write('\n  NO   OCC          E(Eh)            E(eV) \n')
+        for i, energy in enumerate(self.mo_energies()):
+            occupation = 2.0 if i < self.nocc else 0.0
+            self.write(f'{i:4d}   {occupation:6.4f}    {energy:12.6f}    {energy * 27.21138505:12.4f} \n')
+        self.write('\n')
+
+    def mo_energies(self):
+        """Return the orbital energies in Hartree, increasing and with the gap between the occupied and virtuals."""
+        return [
+            -10.0 + 9.5 * i / self.nocc if i < self.nocc else 0.1 + 0.05 * (i - self.nocc) for i in range(self.nbasis)
+        ]
+
+    def molecular_orbitals(self):
+        """Write the coefficients in blocks of six orbitals, and each basis function labelled with its atom."""
+        energies = self.mo_energies()
+        labels = []
+        for j in range(self.nbasis):
+            atom = j * self.natom // self.nbasis
+            first = -(-atom * self.nbasis // self.natom)
+            labels.append(f'{atom:3d}{self.elements[atom][0]:<2s}  {ORBITALS[(j - first) % len(ORBITALS)]:<6s}')
+
+        self.write(_banner('MOLECULAR ORBITALS'))
+        for start in range(0, self.nbasis, 6):
+            columns = range(start, min(start + 6, self.nbasis))
+            self.write('                 ' + ''.join(f'{i:10d}' for i in columns) + '\n')
+            self.write('                 ' + ''.join(f'{energies[i]:10.5f}' for i in columns) + '\n')
+            self.write('                 ' + ''.join(f'{2.0 if i < self.nocc else 0.0:10.5f}' for i in columns) + '\n')
+            self.write('                 ' + '  --------' * len(columns) + '\n')
+            for j, label in enumerate(labels):
+                coefficients = ''.join(f'{self.random.uniform(-1, 1) / (1 + abs(i - j)):10.6f}' for i in columns)
+                self.write(f'{label}{coefficients}\n')
+        self.write('\n')
+
+    def charges(self):
+        """Write the Mulliken and Loewdin charges."""
+        charges = [self.random.uniform(-0.5, 0.5) for _ in range(self.natom)]
+        self.write(_banner('MULLIKEN ATOMIC CHARGES'))
+        for i, ((symbol, _, _), charge) in enumerate(zip(self.elements, charges)):
+            self.write(f'{i:4d} {symbol:<2s}:{charge:12.6f}\n')
+        self.write(f'Sum of atomic charges:{sum(charges):12.7f}\n\n')
+        self.write(_banner('LOEWDIN ATOMIC CHARGES'))
+        for i, ((symbol, _, _), charge) in enumerate(zip(self.elements, charges)):
+            self.write(f'{i:4d} {symbol:<2s}:{0.6 * charge:12.6f}\n')
+        self.write('\n')
+
+    def gradient(self):
+        self.write(_banner('CARTESIAN GRADIENT'))
+        self.write('\n')
+        for i, (symbol, _, _) in enumerate(self.elements):
+            gradient = ''.join(f'{self.random.uniform(-0.01, 0.01):15.9f}' for _ in range(3))
+            self.write(f'{i + 1:4d}   {symbol:<2s}  :{gradient}\n')
+        self.write('\nNorm of the cartesian gradient     ...    0.0145719348\n\n')
+
+    def geometry_convergence(self, cycle):
+        """Write the convergence table of an optimization cycle, without the energy change in the first one."""
+        scale = 10.0 / cycle**2
+        items = [
+            ('Energy change', -5.0e-6 * scale, 5.0e-6),
+            ('RMS gradient', 1.0e-4 * scale, 1.0e-4),
+            ('MAX gradient', 3.0e-4 * scale, 3.0e-4),
+            ('RMS step', 2.0e-3 * scale, 2.0e-3),
+            ('MAX step', 4.0e-3 * scale, 4.0e-3),
+        ]
+        if cycle == 1:
+            items = items[1:]
+        self.write('                                .--------------------.\n')
+        self.write('          ----------------------|Geometry convergence|-------------------------\n')
+        self.write('          Item                value                   Tolerance       Converged\n')
+        self.write('          ---------------------------------------------------------------------\n')
+        for name, value, target in items:
+            converged = 'YES' if abs(value) < target else 'NO'
+            self.write(f'          {name:<18s}{value:14.10f}{target:18.10f}      {converged}\n')
+        self.write('          ---------------------------------------------------------------------\n\n')
+
+    def write_stationary_point(self):
+        self.write('                    ***********************HURRAY********************\n')
+        self.write('                    ***        THE OPTIMIZATION HAS CONVERGED     ***\n')
+        self.write('                    *************************************************\n\n')
+        self.write('                 *******************************************************\n')
+        self.write('                 *** FINAL ENERGY EVALUATION AT THE STATIONARY POINT ***\n')
+        self.write(f'                 ***               (AFTER {self.opt_cycles:4d} CYCLES)               ***\n')
+        self.write('                 *******************************************************\n')
+
+    def tddft(self):
+        """Write the TDA excited states and their absorption spectrum."""
+        energies = [0.2 + 0.01 * root for root in range(self.tddft_roots)]
+        self.write(_banner('TD-DFT/TDA EXCITED STATES (SINGLETS)'))
+        self.write('\nthe weight of the individual excitations are printed if larger than 0.01\n\n')
+        for root, energy in enumerate(energies, 1):
+            self.write(
+                f'STATE {root:3d}:  E= {energy:10.6f} au {energy * 27.21138505:10.3f} eV '
+                f'{energy * 219474.63:10.1f} cm**-1 <S**2> =   0.000000\n'
+            )
+            occupied = self.nocc - 1 - (root - 1) % self.nocc
+            virtual = self.nocc + (root - 1) % (self.nbasis - self.nocc)
+            self.write(f'{occupied:6d}a ->{virtual:5d}a  :     0.985000 (c= -0.99247166)\n\n')
+        self.write('\n')
+        self.write('-' * 77 + '\n')
+        self.write('         ABSORPTION SPECTRUM VIA TRANSITION ELECTRIC DIPOLE MOMENTS\n')
+        self.write('-' * 77 + '\n')
+        self.write('State   Energy    Wavelength  fosc         T2        TX        TY        TZ  \n')
+        self.write('        (cm-1)      (nm)                 (au**2)    (au)      (au)      (au) \n')
+        self.write('-' * 77 + '\n')
+        for root, energy in enumerate(energies, 1):
+            wavenumber = energy * 219474.63
+            self.write(
+                f'{root:4d} {wavenumber:9.1f}    {1e7 / wavenumber:5.1f}   {0.1 / root:11.9f}   0.64810'
+                '  -0.33760   0.65132   0.33154\n'
+            )
+        self.write('\n')
+
+    def dipole_moment(self):
+        self.write(_banner('DIPOLE MOMENT'))
+        self.write('                                X             Y             Z\n')
+        self.write('Electronic contribution:      0.10001      -0.20001      -0.00001\n')
+        self.write('Nuclear contribution   :     -0.00001       0.00001       0.30001\n')
+        self.write('                        -----------------------------------------\n')
+        self.write('Total Dipole Moment    :      0.10000      -0.20000       0.30000\n')
+        self.write('                        -----------------------------------------\n\n')
+
+    def frequencies(self):
+        """Write the vibrational frequencies, normal modes, IR spectrum and thermochemistry."""
+        nmodes = 3 * self.natom
+        frequencies = [0.0] * 6 + [100.0 + 3500.0 * i / nmodes for i in range(nmodes - 6)]
+
+        self.write(_banner('VIBRATIONAL FREQUENCIES'))
+        self.write('\n')
+        if float(self.version[:3]) > 4.0:
+            self.write('Scaling factor for frequencies =  1.000000000  (already applied!)\n\n')
+        for i, frequency in enumerate(frequencies):
+            self.write(f'{i:5d}:   {frequency:10.2f} cm**-1\n')
+        self.write('\n\n')
+
+        self.write(_banner('NORMAL MODES'))
+        self.write('\nThese modes are the Cartesian displacements weighted by the diagonal matrix\n')
+        self.write('M(i,i)=1/sqrt(m[i]) where m[i] is the mass of the displaced atom\n')
+        self.write('Thus, these vectors are normalized but *not* orthogonal\n\n')
+        self.block_matrix(nmodes, nmodes, lambda i, j: 0.0 if j < 6 else self.random.uniform(-0.5, 0.5))
+        self.write('\n\n')
+
+        self.write(_banner('IR SPECTRUM'))
+        self.write('\n')
+        if self.major > 4:
+            self.write(' Mode   freq       eps      Int      T**2         TX        TY        TZ\n')
+            self.write('       cm**-1   L/(mol*cm) km/mol    a.u.\n')
+            self.write('-' * 76 + '\n')
+            for i in range(6, nmodes):
+                self.write(
+                    f'{i:4d}:  {frequencies[i]:8.2f}   0.002792   {i:5.2f}  0.000583  '
+                    '( 0.006362  0.004894 -0.022777)\n'
+                )
+        else:
+            self.write(' Mode    freq (cm**-1)   T**2         TX         TY         TZ\n')
+            self.write('-' * 67 + '\n')
+            for i in range(6, nmodes):
+                self.write(f'{i:5d}:  {frequencies[i]:10.2f}   {i:9.6f}  ( -0.000000   0.914970  -0.914970)\n')
+        self.write('\n\n')
+
+        self.write(_banner('THERMOCHEMISTRY AT 298.15K'))
+        self.write('\nTemperature         ... 298.15 K\n')
+        self.write('Pressure            ... 1.00 atm\n')
+        self.write(f'Total Mass          ... {sum(element[2] for element in self.elements):.2f} AMU\n\n')
+        self.write('Summary of contributions to the inner energy U:\n')
+        self.write(f'Electronic energy                ... {self.energy:16.8f} Eh\n')
+        self.write('Zero point energy                ...      0.04475065 Eh      28.08 kcal/mol\n')
+        self.write('Thermal vibrational correction   ...      0.00002842 Eh       0.02 kcal/mol\n')
+        self.write('Thermal rotational correction    ...      0.00141627 Eh       0.89 kcal/mol\n')
+        self.write('Thermal translational correction ...      0.00141627 Eh       0.89 kcal/mol\n')
+        self.write('-----------------------------------------------------------------------\n')
+        self.write(f'Total thermal energy                 {self.energy + 0.0476:16.8f} Eh\n\n')
+        self.write('Total free energy                 ...    -40.30941298 Eh\n')
+        self.write('Thermal Enthalpy correction       ...      0.00094421 Eh       0.59 kcal/mol\n')
+        self.write('-----------------------------------------------------------------------\n')
+        self.write(f'Total Enthalpy                    ... {self.energy + 0.0485:16.8f} Eh\n\n')
+        self.write('Electronic entropy                ...      0.00000000 Eh      0.00 kcal/mol\n')
+        self.write('Vibrational entropy               ...      0.00003235 Eh      0.02 kcal/mol\n')
+        self.write('Rotational entropy                ...      0.00606378 Eh      3.81 kcal/mol\n')
+        self.write('Translational entropy             ...      0.01621617 Eh     10.18 kcal/mol\n')
+        self.write('-----------------------------------------------------------------------\n')
+        self.write('Final entropy term                ...      0.02231230 Eh     14.00 kcal/mol\n\n')
+        self.write(f'Final Gibbs free energy         ... {self.energy + 0.0262:16.8f} Eh\n')
+        self.write('-----------------------------------------------------------------------\n\n')
+
+    def block_matrix(self, nrows, ncols, value):
+        """Write a matrix in blocks of six columns, each with a header line and one indexed line per row."""
+        for start in range(0, ncols, 6):
+            columns = range(start, min(start + 6, ncols))
+            self.write('          ' + ''.join(f'{i:11d}' for i in columns) + '    \n')
+            for i in range(nrows):
+                self.write(f'{i:7d}    ' + ''.join(f'{value(i, j):11.6f}' for j in columns) + '\n')
+
+    def footer(self):
+        self.write('                             ****ORCA TERMINATED NORMALLY****\n')
+        self.write('TOTAL RUN TIME: 0 days 0 hours 0 minutes 7 seconds 601 msec\n')
+
+
+def write_orca_output(
+    handle,
+    natom=5,
+    nbasis=None,
+    opt_cycles=0,
+    tddft_roots=0,
+    print_mos=False,
+    print_overlap=False,
+    freq=False,
+    version='5.0.3',
+    seed=0
+):
+    """Write a synthetic ORCA output to a text handle.
+
+    :param handle: text handle to write the output to
+    :param natom: number of atoms, cycling through C, H, O and N
+    :param nbasis: number of basis functions, by default twice the number of occupied orbitals or at least five per atom
+    :param opt_cycles: number of geometry optimization cycles, or zero for a single point calculation
+    :param tddft_roots: number of TDA excited states to print, if any
+    :param print_mos: whether to print the molecular orbital coefficients
+    :param print_overlap: whether to print the overlap matrix
+    :param freq: whether to print the frequencies, normal modes, IR spectrum and thermochemistry
+    :param version: ORCA version to mimic, either 4.x.x or 5.x.x
+    :param seed: seed of the random numbers filling the output
+    """
+    # pylint: disable=too-many-arguments
+    _SyntheticOutput(handle, natom, nbasis, opt_cycles, tddft_roots, print_mos, print_overlap, freq, version,
+                     seed).generate()
+
+
+def generate_orca_output(**kwargs):
+    """Return a synthetic ORCA output as a string, see :func:`write_orca_output` for the arguments."""
+    handle = io.StringIO()
+    write_orca_output(handle, **kwargs)
+    return handle.getvalue()
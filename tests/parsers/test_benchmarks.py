@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""Benchmarks of the output parsing on synthetic ORCA outputs of increasing size.
+
+Besides the timings collected by ``pytest-benchmark``, each benchmark records the size of the output and, in its
+``extra_info``, the throughput in lines and megabytes per second and the peak memory allocated while parsing. See the
+developer guide for how to store a baseline and fail on regressions against it.
+"""
+import tracemalloc
+
+import pytest
+
+from aiida_orca.parsers.cclib.ccio import ccread
+from aiida_orca.parsers.cclib.logfileparser import openlogfile
+from aiida_orca.parsers.cclib.orcaparser import _SECTIONS, ORCA
+
+#: Outputs of increasing size, as parameters of :func:`write_orca_output`.
+SIZES = {
+    'small': {
+        'natom': 10,
+        'opt_cycles': 2,
+        'print_mos': True,
+        'freq': True,
+        'tddft_roots': 10
+    },
+    'medium': {
+        'natom': 40,
+        'nbasis': 400,
+        'opt_cycles': 10,
+        'print_mos': True,
+        'freq': True,
+        'tddft_roots': 50
+    },
+    'large': {
+        'natom': 100,
+        'nbasis': 1000,
+        'opt_cycles': 20,
+        'print_mos': True,
+        'freq': True,
+        'tddft_roots': 100
+    },
+}
+
+#: The expensive sections, with the outputs on which their handler is timed.
+SECTIONS = {
+    'scf_iterations': {
+        'natom': 40,
+        'nbasis': 400
+    },
+    'cartesian_coordinates': {
+        'natom': 500,
+        'opt_cycles': 1
+    },
+    'cartesian_gradient': {
+        'natom': 500,
+        'opt_cycles': 1
+    },
+    'molecular_orbitals': {
+        'natom': 40,
+        'nbasis': 600,
+        'print_mos': True
+    },
+    'overlap_matrix': {
+        'natom': 40,
+        'nbasis': 600,
+        'print_overlap': True
+    },
+    'normal_modes': {
+        'natom': 150,
+        'freq': True
+    },
+    'excited_states': {
+        'natom': 40,
+        'nbasis': 400,
+        'tddft_roots': 500
+    },
+}
+
+
+def output_size(filepath):
+    """Return the number of lines and bytes of an output."""
+    with open(filepath, 'rb') as handle:
+        lines = sum(1 for _ in handle)
+    return lines, filepath.stat().st_size
+
+
+def record_throughput(benchmark, lines, nbytes, peak_memory):
+    """Record the size of the parsed text, the throughput of the benchmark and the peak memory in its ``extra_info``."""
+    megabytes = nbytes / 2**20
+
+    mean = benchmark.stats.stats.mean
+    benchmark.extra_info.update({
+        'lines': lines,
+        'megabytes': megabytes,
+        'lines_per_second': lines / mean,
+        'mb_per_second': megabytes / mean,
+        'peak_memory_mb': peak_memory / 2**20,
+    })
+
+
+def measure_peak_memory(function, *args, **kwargs):
+    """Call the function once and return the peak memory it allocated, in bytes.
+
+    Tracing the allocations slows the function down considerably, so this is only done when benchmarks are enabled.
+    When they are disabled, for example with ``--benchmark-disable``, the benchmarks are run once as regular tests.
+    """
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def open_at_section(filepath, name):
+    """Parse the output up to the first line opening the named section.
+
+    :return: the parser, the open output positioned right after the line and the line itself
+    """
+    parser = ORCA(str(filepath))
+    parser.before_parsing()
+    inputfile = openlogfile(str(filepath))
+    for line in inputfile:
+        index = _SECTIONS.match(line)
+        if index is not None and _SECTIONS.sections[index].name == name:
+            return parser, inputfile, line
+        parser.extract(inputfile, line)
+    raise ValueError(f'The section {name} is not in {filepath}.')
+
+
+@pytest.mark.benchmark(group='ccread')
+@pytest.mark.parametrize('size', SIZES)
+def test_ccread(benchmark, generate_orca_output, size):
+    """Benchmark parsing a whole output with ``ccread``."""
+    filepath = generate_orca_output(**SIZES[size])
+
+    data = benchmark(ccread, str(filepath))
+
+    assert data.metadata['success']
+    if not benchmark.disabled:
+        record_throughput(benchmark, *output_size(filepath), measure_peak_memory(ccread, str(filepath)))
+
+
+@pytest.mark.benchmark(group='sections')
+@pytest.mark.parametrize('name', SECTIONS)
+def test_section(benchmark, generate_orca_output, name):
+    """Benchmark the handler of an expensive section, from the line opening it."""
+    filepath = generate_orca_output(**SECTIONS[name])
+    handler = getattr(ORCA, f'extract_{name}')
+    opened = []
+
+    def setup():
+        parser, inputfile, line = open_at_section(filepath, name)
+        opened.append(inputfile)
+        return (parser, inputfile, line), {}
+
+    try:
+        benchmark.pedantic(handler, setup=setup, rounds=5)
+        if benchmark.disabled:
+            return
+        args, _ = setup()
+        inputfile = args[1]
+        lineno, pos = inputfile.lineno, inputfile.pos
+        peak_memory = measure_peak_memory(handler, *args)
+        # The throughput is that of the section, whose first line was read before the handler was called.
+        lines, nbytes = inputfile.lineno - lineno + 1, inputfile.pos - pos + len(args[2])
+    finally:
+        for inputfile in opened:
+            inputfile.close()
+
+    record_throughput(benchmark, lines, nbytes, peak_memory)
+
+
+@pytest.mark.benchmark(group='parser')
+@pytest.mark.parametrize('size', SIZES)
+def test_parser(
+    benchmark, aiida_localhost, generate_calc_job_node, generate_parser, generate_inputs_orca, generate_orca_output,
+    size
+):
+    """Benchmark the ``OrcaBaseParser``, including the removal of NaNs and the construction of the ``Dict`` output."""
+    from aiida import orm
+    from aiida.common import LinkType
+
+    # A single point, since the relaxed structure of an optimization is not written by the synthetic outputs.
+    parameters = dict(SIZES[size], opt_cycles=0)
+    filepath = generate_orca_output(**parameters)
+
+    node = generate_calc_job_node('orca.orca', aiida_localhost, inputs=generate_inputs_orca())
+    retrieved = orm.FolderData()
+    retrieved.put_object_from_file(str(filepath), 'aiida.out')
+    retrieved.add_incoming(node, link_type=LinkType.CREATE, link_label='retrieved')
+    retrieved.store()
+
+    parser = generate_parser('orca_base_parser')
+    results, calcfunction = benchmark(parser.parse_from_node, node, store_provenance=False)
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    assert 'output_parameters' in results
+    if not benchmark.disabled:
+        peak_memory = measure_peak_memory(parser.parse_from_node, node, store_provenance=False)
+        record_throughput(benchmark, *output_size(filepath), peak_memory)
@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 """Tests for the :class:`aiida_orca.parsers.OrcaBaseParser` parser."""
+import pathlib
+
+import pytest
 
 from aiida_orca.calculations import OrcaCalculation
 
@@ -62,7 +65,8 @@ def test_orca_unrestricted(
     results, calcfunction = parser.parse_from_node(node)
 
     assert calcfunction.is_finished, calcfunction.exception
-    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    # The optimization of this example stops at the maximum number of cycles, set to 2 in the input
+    assert calcfunction.exit_status == OrcaCalculation.exit_codes.ERROR_OPTIMIZATION_NOT_CONVERGED.status  # pylint: disable=no-member
     assert 'output_parameters' in results
 
     data_regression.check({
@@ -112,3 +116,312 @@ def test_orca_missing_stdout(aiida_localhost, generate_calc_job_node, generate_p
     assert calcfunction.exit_status == OrcaCalculation.exit_codes.ERROR_OUTPUT_STDOUT_MISSING.status  # pylint: disable=no-member
     assert 'relaxed_structure' not in results
     assert 'output_parameters' not in results
+
+
+def test_orca_parser_settings(aiida_localhost, generate_calc_job_node, generate_parser, generate_inputs_orca):
+    """Test that sections whose attributes are not requested in ``parser_settings`` are skipped."""
+    from aiida.orm import Dict
+
+    name = 'default'
+    entry_point_calc_job = 'orca.orca'
+    entry_point_parser = 'orca_base_parser'
+
+    inputs = generate_inputs_orca({'parser_settings': Dict(dict={'attributes': ['scfenergies', 'vibfreqs']})})
+    node = generate_calc_job_node(entry_point_calc_job, aiida_localhost, name, inputs)
+    parser = generate_parser(entry_point_parser)
+    results, calcfunction = parser.parse_from_node(node)
+
+    assert calcfunction.is_finished, calcfunction.exception
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+
+    output_parameters = results['output_parameters'].get_dict()
+    assert 'vibfreqs' in output_parameters
+    assert 'vibdisps' not in output_parameters
+
+
+def test_orca_parser_profile(aiida_localhost, generate_calc_job_node, generate_parser, generate_inputs_orca):
+    """Test that the cost of each section is reported when profiling is requested in ``parser_settings``."""
+    from aiida.orm import Dict
+
+    name = 'default'
+    entry_point_calc_job = 'orca.orca'
+    entry_point_parser = 'orca_base_parser'
+
+    inputs = generate_inputs_orca({'parser_settings': Dict(dict={'profile': True})})
+    node = generate_calc_job_node(entry_point_calc_job, aiida_localhost, name, inputs)
+    parser = generate_parser(entry_point_parser)
+    results, calcfunction = parser.parse_from_node(node)
+
+    assert calcfunction.is_finished, calcfunction.exception
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+
+    metadata = results['output_parameters']['metadata']
+    assert metadata['parse_time'] > 0
+    assert metadata['section_profile']['scf_iterations']['calls'] == 4
+    assert metadata['section_profile']['normal_modes']['lines'] > 0
+
+
+def test_orca_output_arrays(aiida_localhost, generate_calc_job_node, generate_parser, generate_inputs_orca):
+    """Test that array attributes above the ``array_threshold`` of ``parser_settings`` are stored as ``ArrayData``."""
+    from aiida.orm import Dict
+
+    name = 'default'
+    entry_point_calc_job = 'orca.orca'
+    entry_point_parser = 'orca_base_parser'
+
+    inputs = generate_inputs_orca({'parser_settings': Dict(dict={'array_threshold': 60})})
+    node = generate_calc_job_node(entry_point_calc_job, aiida_localhost, name, inputs)
+    parser = generate_parser(entry_point_parser)
+    results, calcfunction = parser.parse_from_node(node)
+
+    assert calcfunction.is_finished, calcfunction.exception
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+
+    output_parameters = results['output_parameters'].get_dict()
+    output_arrays = results['output_arrays']
+    assert 'vibdisps' not in output_parameters
+    assert 'scfvalues' not in output_parameters
+    assert 'atomcoords' in output_parameters
+    assert output_parameters['arrays'] == {
+        'geovalues': 'geovalues',
+        'scfvalues': [f'scfvalues_{index}' for index in range(4)],
+        'vibdisps': 'vibdisps'
+    }
+    assert set(output_arrays.get_arraynames()) == {'geovalues', 'vibdisps', *output_parameters['arrays']['scfvalues']}
+    assert output_arrays.get_array('vibdisps').shape == (9, 5, 3)
+
+
+def test_orca_non_finite_arrays():
+    """Test that arrays with NaN or infinite values are stored as they are and that the others are not copied."""
+    import numpy as np
+
+    from aiida_orca.parsers import OrcaBaseParser
+
+    finite = np.arange(6.0)
+    output_dict = {
+        'finite': finite,
+        'nan': np.array([1.0, np.nan]),
+        'inf': [np.array([1.0]), np.array([-np.inf])],
+        'ints': np.arange(3),
+    }
+    output_arrays = OrcaBaseParser._split_arrays(output_dict, threshold=1000)  # pylint: disable=protected-access
+
+    assert output_dict['finite'] is finite
+    assert output_dict['arrays'] == {'inf': ['inf_0', 'inf_1'], 'nan': 'nan'}
+    assert np.isnan(output_arrays.get_array('nan')[1])
+    assert output_arrays.get_array('inf_1')[0] == -np.inf
+
+
+def test_orca_fatal_error(aiida_localhost, generate_calc_job_node, generate_parser, generate_inputs_orca):
+    """Test that an output ending with a fatal ORCA error is classified from its tail without the full parse."""
+    name = 'scf_error'
+    entry_point_calc_job = 'orca.orca'
+    entry_point_parser = 'orca_base_parser'
+
+    node = generate_calc_job_node(entry_point_calc_job, aiida_localhost, name, generate_inputs_orca())
+    parser = generate_parser(entry_point_parser)
+    results, calcfunction = parser.parse_from_node(node)
+
+    assert calcfunction.is_finished, calcfunction.exception
+    assert calcfunction.exit_status == OrcaCalculation.exit_codes.ERROR_SCF_NOT_CONVERGED.status  # pylint: disable=no-member
+    assert results['output_parameters'].get_dict() == {
+        'metadata': {
+            'success': False
+        },
+        'error_message': 'ORCA finished by error termination in SCF',
+    }
+
+
+def test_orca_fatal_error_full_parse(aiida_localhost, generate_calc_job_node, generate_parser, generate_inputs_orca):
+    """Test that an output ending with a fatal ORCA error is parsed in full when ``probe_tail`` is disabled."""
+    from aiida.orm import Dict
+
+    name = 'scf_error'
+    entry_point_calc_job = 'orca.orca'
+    entry_point_parser = 'orca_base_parser'
+
+    inputs = generate_inputs_orca({'parser_settings': Dict(dict={'probe_tail': False})})
+    node = generate_calc_job_node(entry_point_calc_job, aiida_localhost, name, inputs)
+    parser = generate_parser(entry_point_parser)
+    results, calcfunction = parser.parse_from_node(node)
+
+    assert calcfunction.is_finished, calcfunction.exception
+    assert calcfunction.exit_status == OrcaCalculation.exit_codes.ERROR_SCF_NOT_CONVERGED.status  # pylint: disable=no-member
+    assert 'error_message' not in results['output_parameters'].get_dict()
+    assert results['output_parameters']['natom'] == 5
+
+
+def test_orca_walltime(aiida_localhost, generate_calc_job_node, generate_parser, generate_inputs_orca):
+    """Test that an output cut short when the scheduler killed the job at the walltime is classified as such."""
+    name = 'walltime'
+    entry_point_calc_job = 'orca.orca'
+    entry_point_parser = 'orca_base_parser'
+
+    inputs = generate_inputs_orca({'metadata': {'options': {'scheduler_stderr': '_scheduler-stderr.txt'}}})
+    node = generate_calc_job_node(entry_point_calc_job, aiida_localhost, name, inputs)
+    parser = generate_parser(entry_point_parser)
+    results, calcfunction = parser.parse_from_node(node)
+
+    assert calcfunction.is_finished, calcfunction.exception
+    assert calcfunction.exit_status == OrcaCalculation.exit_codes.ERROR_OUT_OF_WALLTIME.status  # pylint: disable=no-member
+    assert 'output_parameters' in results
+
+
+def test_orca_offload(aiida_localhost, generate_calc_job_node, generate_parser, generate_inputs_orca):
+    """Test that outputs larger than ``offload_threshold`` are parsed in a separate process, with the same results."""
+    import numpy as np
+
+    from aiida.orm import Dict
+
+    name = 'default'
+    entry_point_calc_job = 'orca.orca'
+    entry_point_parser = 'orca_base_parser'
+    parser = generate_parser(entry_point_parser)
+
+    node = generate_calc_job_node(entry_point_calc_job, aiida_localhost, name, generate_inputs_orca())
+    expected, _ = parser.parse_from_node(node, store_provenance=False)
+
+    inputs = generate_inputs_orca({'parser_settings': Dict(dict={'offload_threshold': 0})})
+    node = generate_calc_job_node(entry_point_calc_job, aiida_localhost, name, inputs)
+    results, calcfunction = parser.parse_from_node(node, store_provenance=False)
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    np.testing.assert_equal(results['output_parameters'].get_dict(), expected['output_parameters'].get_dict())
+    assert results['relaxed_structure'].get_formula() == expected['relaxed_structure'].get_formula()
+    np.testing.assert_allclose(
+        results['relaxed_structure'].get_ase().positions, expected['relaxed_structure'].get_ase().positions
+    )
+
+
+def test_orca_parse_cache(
+    aiida_localhost, generate_calc_job_node, generate_parser, generate_inputs_orca, monkeypatch, tmp_path
+):
+    """Test that an output parsed once is read from the parse cache when it is parsed again."""
+    import numpy as np
+
+    import aiida_orca.parsers
+
+    monkeypatch.setenv('AIIDA_ORCA_PARSE_CACHE', str(tmp_path))
+    name = 'default'
+    entry_point_calc_job = 'orca.orca'
+    entry_point_parser = 'orca_base_parser'
+    parser = generate_parser(entry_point_parser)
+
+    node = generate_calc_job_node(entry_point_calc_job, aiida_localhost, name, generate_inputs_orca())
+    expected, _ = parser.parse_from_node(node, store_provenance=False)
+    assert len(list(tmp_path.glob('*.pkl.z'))) == 1
+
+    def read_output(*_):
+        raise AssertionError('the output should not be parsed again')
+
+    monkeypatch.setattr(aiida_orca.parsers, 'read_output', read_output)
+    results, calcfunction = parser.parse_from_node(node, store_provenance=False)
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    np.testing.assert_equal(results['output_parameters'].get_dict(), expected['output_parameters'].get_dict())
+
+
+def test_parse_cache_eviction(tmp_path):
+    """Test that the least recently used entries are removed when the cache grows beyond its size."""
+    import os
+
+    from aiida_orca.parsers.cache import ParseCache
+
+    cache = ParseCache(str(tmp_path))
+    for index, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, {'value': key * 1000})
+        os.utime(tmp_path / f'{key}.pkl.z', (index, index))
+    assert cache.get('a') == {'value': 'a' * 1000}
+
+    cache.max_size = sum(path.stat().st_size for path in tmp_path.iterdir()) - 1
+    cache.evict()
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+
+    (tmp_path / 'c.pkl.z').write_bytes(b'corrupted')
+    assert cache.get('c') is None
+    assert not (tmp_path / 'c.pkl.z').exists()
+
+
+@pytest.mark.parametrize('compression', ['gzip', 'bzip2', 'xz'])
+def test_orca_compressed(
+    aiida_localhost, generate_calc_job_node, generate_parser, generate_inputs_orca, tmp_path, compression
+):
+    """Test that an output compressed on the remote is parsed as the uncompressed output is."""
+    import bz2
+    import gzip
+    import lzma
+    import shutil
+
+    import numpy as np
+
+    from aiida.common import LinkType
+    from aiida.orm import FolderData
+
+    from aiida_orca.parsers.compressed import EXTENSIONS
+
+    fixture = pathlib.Path(__file__).parent / 'fixtures' / 'orca' / 'default'
+    module = {'gzip': gzip, 'bzip2': bz2, 'xz': lzma}[compression]
+    (tmp_path /
+     f'aiida.out{EXTENSIONS[compression]}').write_bytes(module.compress((fixture / 'aiida.out').read_bytes()))
+    shutil.copy(fixture / 'aiida.xyz', tmp_path)
+
+    entry_point_calc_job = 'orca.orca'
+    entry_point_parser = 'orca_base_parser'
+    parser = generate_parser(entry_point_parser)
+
+    node = generate_calc_job_node(entry_point_calc_job, aiida_localhost, 'default', generate_inputs_orca())
+    expected, _ = parser.parse_from_node(node, store_provenance=False)
+
+    node = generate_calc_job_node(entry_point_calc_job, aiida_localhost, None, generate_inputs_orca())
+    retrieved = FolderData()
+    retrieved.put_object_from_tree(str(tmp_path))
+    retrieved.add_incoming(node, link_type=LinkType.CREATE, link_label='retrieved')
+    retrieved.store()
+    results, calcfunction = parser.parse_from_node(node, store_provenance=False)
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    np.testing.assert_equal(results['output_parameters'].get_dict(), expected['output_parameters'].get_dict())
+    assert results['relaxed_structure'].get_formula() == expected['relaxed_structure'].get_formula()
+
+
+def test_orca_temporary(aiida_localhost, generate_calc_job_node, generate_parser, generate_inputs_orca, tmp_path):
+    """Test that an output retrieved to the temporary folder is parsed, and that its digest is stored."""
+    import shutil
+
+    import numpy as np
+
+    from aiida.common import LinkType
+    from aiida.orm import FolderData
+
+    fixture = pathlib.Path(__file__).parent / 'fixtures' / 'orca' / 'default'
+    shutil.copy(fixture / 'aiida.out', tmp_path)
+
+    entry_point_calc_job = 'orca.orca'
+    entry_point_parser = 'orca_base_parser'
+    parser = generate_parser(entry_point_parser)
+
+    node = generate_calc_job_node(entry_point_calc_job, aiida_localhost, 'default', generate_inputs_orca())
+    expected, _ = parser.parse_from_node(node, store_provenance=False)
+
+    inputs = generate_inputs_orca()
+    inputs['metadata']['options']['output_digest'] = True
+    node = generate_calc_job_node(entry_point_calc_job, aiida_localhost, None, inputs)
+    retrieved = FolderData()
+    retrieved.put_object_from_file(str(fixture / 'aiida.xyz'), 'aiida.xyz')
+    retrieved.add_incoming(node, link_type=LinkType.CREATE, link_label='retrieved')
+    retrieved.store()
+    results, calcfunction = parser.parse_from_node(
+        node, store_provenance=False, retrieved_temporary_folder=str(tmp_path)
+    )
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    np.testing.assert_equal(results['output_parameters'].get_dict(), expected['output_parameters'].get_dict())
+
+    digest = results['output_digest'].get_content()
+    assert '****END OF INPUT****' in digest
+    assert '162: WARNING: Geometry Optimization' in digest
+    assert '1873: FINAL SINGLE POINT ENERGY       -39.967975451632' in digest
+    assert 'ORCA TERMINATED NORMALLY' in digest
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Tests for the :class:`aiida_orca.parsers.batch.OrcaBatchParser` parser."""
+import os
+
+import pytest
+
+from aiida_orca.calculations import OrcaBatchCalculation, OrcaCalculation
+
+
+@pytest.mark.parametrize('max_workers', (1, 2))
+def test_orca_batch(aiida_localhost, generate_calc_job_node, generate_parser, generate_structure, max_workers):
+    """Test parsing the items of a batch, of which one failed and one was not retrieved."""
+    from aiida import orm
+    from aiida.common import LinkType
+
+    items = {'optimization': 'default', 'tddft': 'tddft', 'error': 'scf_error', 'missing': None}
+    inputs = {
+        'structures': {item: generate_structure.clone() for item in items},
+        'parameters': orm.Dict(dict={
+            'charge': 0,
+            'multiplicity': 1
+        }),
+        'parser_settings': orm.Dict(dict={'max_workers': max_workers}),
+    }
+    node = generate_calc_job_node('orca.batch', aiida_localhost, inputs=inputs)
+
+    basepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'orca')
+    retrieved = orm.FolderData()
+    for item, name in items.items():
+        if name is not None:
+            retrieved.put_object_from_tree(os.path.join(basepath, name), item)
+    retrieved.add_incoming(node, link_type=LinkType.CREATE, link_label='retrieved')
+    retrieved.store()
+
+    parser = generate_parser('orca_batch_parser')
+    results, calcfunction = parser.parse_from_node(node)
+
+    assert calcfunction.is_finished, calcfunction.exception
+    assert calcfunction.exit_status == OrcaBatchCalculation.exit_codes.ERROR_ITEMS_UNSUCCESSFUL.status  # pylint: disable=no-member
+    assert calcfunction.exit_message.startswith('The calculations of some items were unsuccessful: error, missing.')
+
+    output_parameters = results['output_parameters']
+    assert sorted(output_parameters) == sorted(items)
+    assert output_parameters['optimization']['exit_status'] == 0
+    assert output_parameters['tddft']['exit_status'] == 0
+    assert len(output_parameters['tddft']['etenergies']) > 0
+    assert output_parameters['error']['exit_status'] == OrcaCalculation.exit_codes.ERROR_SCF_NOT_CONVERGED.status  # pylint: disable=no-member
+    assert output_parameters['missing']['exit_status'] == OrcaCalculation.exit_codes.ERROR_OUTPUT_STDOUT_MISSING.status  # pylint: disable=no-member
+    assert list(results['relaxed_structures']) == ['optimization']
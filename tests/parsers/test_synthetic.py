@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Tests for the cclib ORCA parser on synthetic outputs of sizes beyond the fixtures."""
+import pickle
+
+import numpy as np
+import pytest
+
+from aiida_orca.parsers.cclib.ccio import ccread
+from aiida_orca.parsers.cclib.logfileparser import ParserCheckpoint
+
+
+@pytest.mark.parametrize('version', ['4.2.1', '5.0.3'])
+@pytest.mark.parametrize('natom,nbasis', [(5, None), (40, 250)])
+def test_optimization_frequencies(generate_orca_output, version, natom, nbasis):
+    """Test a geometry optimization followed by a frequency calculation."""
+    filepath = generate_orca_output(natom=natom, nbasis=nbasis, opt_cycles=4, freq=True, version=version)
+    data = ccread(str(filepath))
+
+    assert data.metadata['success']
+    assert data.natom == natom
+    assert data.atomcoords.shape == (5, natom, 3)
+    assert len(data.scfenergies) == 5
+    assert data.geovalues.shape == (4, 5)
+    assert data.optdone
+    assert data.vibfreqs.shape == (3 * natom - 6,)
+    assert data.vibdisps.shape == (3 * natom - 6, natom, 3)
+    assert data.vibirs.shape == (3 * natom - 6,)
+    assert np.all(data.vibdisps[0] != 0)
+
+
+@pytest.mark.parametrize('nbasis', [13, 300])
+def test_molecular_orbitals(generate_orca_output, nbasis):
+    """Test the molecular orbitals and overlap matrix of a single point with TDDFT."""
+    filepath = generate_orca_output(natom=6, nbasis=nbasis, tddft_roots=10, print_mos=True, print_overlap=True)
+    data = ccread(str(filepath))
+
+    assert data.metadata['success']
+    assert data.nbasis == nbasis
+    assert data.mocoeffs[0].shape == (nbasis, nbasis)
+    assert data.aooverlaps.shape == (nbasis, nbasis)
+    np.testing.assert_array_equal(np.diag(data.aooverlaps), 1.0)
+    assert len(data.aonames) == nbasis
+    assert sum(len(basis) for basis in data.atombasis) == nbasis
+    assert len(data.etenergies) == 10
+    assert len(data.etsecs) == 10
+
+
+def test_parse_attributes(generate_orca_output):
+    """Test that skipping the sections of attributes which are not requested leaves the other attributes unchanged."""
+    filepath = generate_orca_output(natom=10, nbasis=60, opt_cycles=2, print_mos=True, print_overlap=True, freq=True)
+    full = ccread(str(filepath)).getattributes()
+    partial = ccread(str(filepath), attributes=['scfenergies', 'atomcoords', 'vibfreqs']).getattributes()
+
+    assert set(full) - set(partial) == {'aonames', 'atombasis', 'mocoeffs', 'aooverlaps', 'vibdisps'}
+    for key, value in partial.items():
+        np.testing.assert_equal(value, full[key])
+
+
+@pytest.mark.parametrize('fractions', [(0.5,), (0.2, 0.4, 0.6, 0.8), (0.31, 0.3101, 0.95)])
+def test_resume_from_checkpoint(generate_orca_output, tmp_path, fractions):
+    """Test that parsing a growing output from checkpoints gives the same attributes as parsing it at once."""
+    filepath = generate_orca_output(natom=8, nbasis=40, opt_cycles=4, print_mos=True, freq=True, tddft_roots=5)
+    full = ccread(str(filepath)).getattributes()
+    text = filepath.read_text()
+
+    growing = tmp_path / 'growing.out'
+    checkpoint = ParserCheckpoint()
+    for fraction in fractions:
+        growing.write_text(text[:int(fraction * len(text))])
+        ccread(str(growing), checkpoint=checkpoint)
+        assert 0 < checkpoint.offset <= growing.stat().st_size
+        checkpoint = pickle.loads(pickle.dumps(checkpoint))
+
+    growing.write_text(text)
+    resumed = ccread(str(growing), checkpoint=checkpoint).getattributes()
+
+    assert checkpoint.offset == len(text)
+    assert set(resumed) == set(full)
+    for key, value in full.items():
+        np.testing.assert_equal(resumed[key], value)
+
+
+def test_checkpoint_other_file(generate_orca_output):
+    """Test that a file which does not match the checkpoint is parsed from the start."""
+    checkpoint = ParserCheckpoint()
+    ccread(str(generate_orca_output('first.out', natom=5, opt_cycles=1)), checkpoint=checkpoint)
+    data = ccread(str(generate_orca_output('second.out', natom=7, opt_cycles=2)), checkpoint=checkpoint)
+
+    assert data.natom == 7
+    assert len(data.scfenergies) == 3
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Tests for the probe of the end of ORCA outputs in :mod:`aiida_orca.parsers.tail`."""
+import io
+
+import pytest
+
+from aiida_orca.parsers.tail import classify_error, killed_by_walltime, probe_tail, read_stream_tail, read_tail
+
+
+def test_read_tail():
+    """Test that the tail starts at a line boundary unless the whole output is read."""
+    output = b'first line\nsecond line\nthird line\n'
+
+    assert read_tail(io.BytesIO(output), size=1024) == output.decode()
+    assert read_tail(io.BytesIO(output), size=15) == 'third line\n'
+
+
+def test_read_stream_tail():
+    """Test that the tail of a decompressed output is the same as that of the uncompressed output."""
+    import gzip
+
+    output = b''.join(f'line {index}\n'.encode() for index in range(100000))
+
+    with gzip.GzipFile(fileobj=io.BytesIO(gzip.compress(output))) as handle:
+        assert read_stream_tail(handle) == read_tail(io.BytesIO(output))
+    assert read_stream_tail(io.BytesIO(output), size=1024) == output.decode()[-1024:].partition('\n')[2]
+    assert read_stream_tail(io.BytesIO(b'one line\n')) == 'one line\n'
+
+
+@pytest.mark.parametrize(
+    'tail,expected', [
+        (
+            '****ORCA TERMINATED NORMALLY****\nTOTAL RUN TIME: 0 days 0 hours 0 minutes 7 seconds 601 msec\n',
+            (True, None)
+        ),
+        (
+            'ORCA finished by error termination in SCF\n  .... aborting the run\n',
+            (False, 'ORCA finished by error termination in SCF')
+        ),
+        ('  4    -39.9675789935  -0.002364162177 0.00719956  0.00211187  0.0065899 0.0000\n', (False, None)),
+    ]
+)
+def test_probe_tail(tail, expected):
+    """Test the detection of the normal and the error termination of ORCA."""
+    assert probe_tail(tail) == expected
+
+
+@pytest.mark.parametrize(
+    'message,expected', [
+        ('INPUT ERROR\nUNRECOGNIZED OR DUPLICATED KEYWORD(S) IN SIMPLE INPUT LINE', 'ERROR_INPUT'),
+        ('There are no basis functions on atom number 3 (Xe)', 'ERROR_BASIS_SET_MISSING'),
+        ('Error (ORCA_MDCI): Not enough memory available!\nPlease increase MaxCore', 'ERROR_INSUFFICIENT_MEMORY'),
+        ('*           SCF NOT CONVERGED AFTER 125 CYCLES      *', 'ERROR_SCF_NOT_CONVERGED'),
+        ('ORCA finished by error termination in GTOInt', None),
+    ]
+)
+def test_classify_error(message, expected):
+    """Test the classification of the error messages of ORCA."""
+    assert classify_error('ORCA finished by error termination\n', message) == expected
+
+
+def test_killed_by_walltime():
+    """Test the detection of walltime kills in the stderr of the scheduler."""
+    assert killed_by_walltime(
+        'slurmstepd: error: *** JOB 4242 ON node017 CANCELLED AT 2022-11-08T10:12:31 DUE TO '
+        'TIME LIMIT ***'
+    )
+    assert killed_by_walltime('=>> PBS: job killed: walltime 3630 exceeded limit 3600')
+    assert not killed_by_walltime('slurmstepd: error: Detected 1 oom-kill event(s)')
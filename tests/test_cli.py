@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Tests for the ``aiida-orca`` command line interface."""
+import pathlib
+import shutil
+
+import pytest
+from click.testing import CliRunner
+
+from aiida_orca.cli import cmd_root
+
+FIXTURES = pathlib.Path(__file__).parent / 'parsers' / 'fixtures' / 'orca'
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parse(tmp_path, workers):
+    """Test that the outputs found in a directory tree are parsed into a table of jobs and tables of arrays."""
+    import numpy as np
+    import pyarrow.parquet as pq
+
+    from aiida_orca.parsers import read_output
+
+    for name in ('default', 'tddft', 'unrestricted'):
+        (tmp_path / 'outputs' / name).mkdir(parents=True)
+        shutil.copy(FIXTURES / name / 'aiida.out', tmp_path / 'outputs' / name / f'{name}.out')
+    (tmp_path / 'outputs' / 'default' / 'aiida.xyz').write_text('not an output')
+
+    result = CliRunner().invoke(
+        cmd_root, ['parse', str(tmp_path / 'outputs'), '-o',
+                   str(tmp_path / 'export'), '-n',
+                   str(workers)]
+    )
+    assert result.exit_code == 0, result.output
+
+    jobs = pq.read_table(tmp_path / 'export' / 'jobs.parquet').to_pydict()
+    assert jobs['job_id'] == [0, 1, 2]
+    assert [pathlib.Path(path).name for path in jobs['path']] == ['default.out', 'tddft.out', 'unrestricted.out']
+    # The unrestricted output has no multiplicity, which is null in the column of the others
+    assert jobs['mult'] == [1, 1, None]
+
+    expected = read_output(jobs['path'][2], {})
+    moenergies = pq.read_table(tmp_path / 'export' / 'arrays' / 'moenergies.parquet').to_pydict()
+    rows = [row for row, job_id in enumerate(moenergies['job_id']) if job_id == 2]
+    assert [moenergies['index'][row] for row in rows] == [0, 1]
+    for row, array in zip(rows, expected['moenergies']):
+        assert moenergies['shape'][row] == list(array.shape)
+        np.testing.assert_allclose(moenergies['values'][row], array.ravel())
+
+
+def test_parse_attributes(tmp_path):
+    """Test that only the requested attributes are parsed, and that unknown attributes are rejected."""
+    import pyarrow.parquet as pq
+
+    output = str(FIXTURES / 'default' / 'aiida.out')
+    result = CliRunner().invoke(cmd_root, ['parse', output, '-o', str(tmp_path), '-n', '1', '-a', 'scfenergies'])
+    assert result.exit_code == 0, result.output
+    assert [path.name for path in (tmp_path / 'arrays').iterdir()] == ['scfenergies.parquet']
+    assert pq.read_table(tmp_path / 'jobs.parquet').to_pydict()['path'] == [output]
+
+    result = CliRunner().invoke(cmd_root, ['parse', output, '-o', str(tmp_path), '-a', 'energies'])
+    assert result.exit_code != 0
+    assert 'unknown cclib attributes: energies' in result.output
+
+
+def test_import(aiida_profile_clean, aiida_localhost, tmp_path):  # pylint: disable=unused-argument
+    """Test that the outputs are imported into the loaded profile and added to the group."""
+    from aiida import orm
+
+    shutil.copy(FIXTURES / 'default' / 'aiida.out', tmp_path / 'default.out')
+    code = orm.InstalledCode(computer=aiida_localhost, filepath_executable='/bin/orca').store()
+
+    result = CliRunner().invoke(cmd_root, ['import', str(tmp_path), '-n', '1', '-c', str(code.pk), '-g', 'imported'])
+    assert result.exit_code == 0, result.output
+    assert 'Imported 1 of 1 outputs' in result.output
+
+    nodes = orm.load_group('imported').nodes
+    assert len(nodes) == 1
+    assert nodes[0].inputs.code.pk == code.pk
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Tests for the bulk import of ORCA calculations run outside of AiiDA."""
+import pathlib
+import shutil
+
+import pytest
+
+from aiida_orca.calculations import OrcaCalculation
+from aiida_orca.utils.importer import import_outputs, parse_input_file
+
+FIXTURES = pathlib.Path(__file__).parent / 'parsers' / 'fixtures' / 'orca'
+
+
+def test_parse_input_file():
+    """Test that the parameters are reconstructed from the input, leaving out the lines that cannot be rendered."""
+    contents = '\n'.join([
+        '### Generated by AiiDA-ORCA Plugin ###',
+        '! B3LYP def2-SVP',
+        '! TightSCF  # comment',
+        '%pal nprocs 4 end',
+        '%maxcore 3000',
+        '%scf',
+        '  MaxIter 200',
+        '  ConvForced true',
+        'end',
+        '*xyz 0 3',
+        'O 0 0 0',
+        '*',
+    ])
+    parameters, skipped = parse_input_file(contents)
+
+    assert parameters == {
+        'input_keywords': ['B3LYP', 'def2-SVP', 'TightSCF'],
+        'input_blocks': {
+            'pal': {
+                'nprocs': '4'
+            },
+            'scf': {
+                'MaxIter': '200',
+                'ConvForced': 'true'
+            },
+        },
+        'charge': 0,
+        'multiplicity': 3,
+    }
+    assert skipped == ['%maxcore 3000']
+
+
+def test_parse_input_file_end_of_setting():
+    """Test that a block is closed by an ``end`` on the line of its last setting."""
+    contents = '\n'.join(['! Opt', '%geom', '  maxiter 10 end', '%method', '  runtyp opt', 'end', '*xyz 0 1', '*'])
+    parameters, skipped = parse_input_file(contents)
+
+    assert parameters['input_blocks'] == {'geom': {'maxiter': '10'}, 'method': {'runtyp': 'opt'}}
+    assert not skipped
+
+
+def test_parse_input_file_unnamed_block():
+    """Test that a block without a name raises a ``ValueError``."""
+    with pytest.raises(ValueError, match='without a name'):
+        parse_input_file('\n'.join(['! SP', '%', '*xyz 0 1', '*']))
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_import_outputs(aiida_profile_clean, aiida_localhost, tmp_path, workers):  # pylint: disable=unused-argument
+    """Test that outputs are imported as finished calculations with the inputs and outputs of an ``OrcaCalculation``."""
+    from aiida import orm
+
+    for name in ('default', 'unrestricted'):
+        shutil.copy(FIXTURES / name / 'aiida.out', tmp_path / f'{name}.out')
+    shutil.copy(FIXTURES / 'default' / 'aiida.xyz', tmp_path / 'default.xyz')
+    (tmp_path / 'empty.out').write_text('')
+    paths = sorted(str(path) for path in tmp_path.iterdir() if path.suffix == '.out')
+
+    code = orm.InstalledCode(computer=aiida_localhost, filepath_executable='/bin/orca').store()
+    group = orm.Group(label='imported').store()
+    imported, failed = import_outputs(paths, code=code, group=group, max_workers=workers, batch_size=1)
+
+    assert [pathlib.Path(path).name for path, _ in failed] == ['empty.out']
+    assert len(imported) == 2
+    assert {node.pk for node in group.nodes} == set(imported)
+
+    default, unrestricted = (orm.load_node(pk) for pk in imported)
+    assert default.process_class is OrcaCalculation
+    assert default.is_finished_ok and default.is_sealed
+    assert default.is_imported
+    assert default.inputs.code.uuid == code.uuid
+    assert default.inputs.parameters.get_dict() == {
+        'input_keywords': ['STO-3G', 'PBE', 'TightOpt', 'AnFreq'],
+        'input_blocks': {
+            'scf': {
+                'ConvForced': 'true',
+                'convergence': 'tight'
+            }
+        },
+        'charge': 0,
+        'multiplicity': 1,
+    }
+    assert default.inputs.structure.get_formula() == default.outputs.relaxed_structure.get_formula()
+    assert default.outputs.output_parameters['metadata']['success']
+
+    assert unrestricted.inputs.parameters['multiplicity'] == 2
+    assert unrestricted.inputs.parameters['input_blocks'] == {'geom': {'MaxIter': '2'}}
+    assert unrestricted.exit_status == OrcaCalculation.exit_codes.ERROR_OPTIMIZATION_NOT_CONVERGED.status  # pylint: disable=no-member
+
+
+def test_import_outputs_error(aiida_profile_clean, tmp_path, monkeypatch):  # pylint: disable=unused-argument
+    """Test that an output whose nodes cannot be created is reported as failed, without aborting its batch."""
+    from aiida_orca.utils import importer
+
+    for name in ('default', 'unrestricted'):
+        shutil.copy(FIXTURES / name / 'aiida.out', tmp_path / f'{name}.out')
+    paths = sorted(str(path) for path in tmp_path.iterdir())
+    create_calculation = importer.create_calculation
+
+    def create_or_fail(filepath, parsed, code=None):
+        if filepath.endswith('default.out'):
+            raise KeyError('atomnos')
+        return create_calculation(filepath, parsed, code)
+
+    monkeypatch.setattr(importer, 'create_calculation', create_or_fail)
+    imported, failed = import_outputs(paths, batch_size=2)
+
+    assert failed == [(paths[0], "KeyError: 'atomnos'")]
+    assert len(imported) == 1
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Tests for the cost of importing the plugin, which every daemon worker and ``verdi`` invocation pays when it loads the
+entry points."""
+import subprocess
+import sys
+
+import pytest
+
+#: Modules loaded by the entry points of the plugin.
+ENTRY_POINT_MODULES = (
+    'aiida_orca.calculations', 'aiida_orca.parsers', 'aiida_orca.parsers.batch', 'aiida_orca.workchains'
+)
+
+#: Modules only needed to parse outputs, which loading the entry points must not import.
+HEAVY_MODULES = (
+    'ase',
+    'scipy',
+    'periodictable',
+    'aiida_orca.parsers.cclib.ccio',
+    'aiida_orca.parsers.cclib.logfileparser',
+    'aiida_orca.parsers.cclib.orcaparser',
+)
+
+#: Budget of the time to import the entry point modules once ``aiida-core`` is imported, in seconds. Importing them
+#: takes around 10 ms, while importing the heavy modules takes around 500 ms.
+IMPORT_TIME_BUDGET = 0.15
+
+
+@pytest.fixture(scope='module')
+def import_times():
+    """Return the nesting level and cumulative import time, in seconds, of each module imported by the entry point
+    modules, as reported by ``python -X importtime`` in a new interpreter that first imports ``aiida-core``."""
+    code = f'import aiida.engine, aiida.orm, aiida.parsers, aiida.plugins; import {", ".join(ENTRY_POINT_MODULES)}'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True,
+                            text=True,
+                            check=True)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if not line.startswith('import time:') or not fields[1].strip().isdigit():
+            continue
+        # The names are indented by two spaces per level, after the space following the separator.
+        level = (len(fields[2]) - len(fields[2].lstrip()) - 1) // 2
+        times[fields[2].strip()] = (level, int(fields[1]) / 1e6)
+    return times
+
+
+def test_heavy_modules(import_times):  # pylint: disable=redefined-outer-name
+    """Test that loading the entry points does not import the modules only needed to parse outputs."""
+    assert not set(HEAVY_MODULES) & set(import_times)
+
+
+def test_import_time(import_times):  # pylint: disable=redefined-outer-name
+    """Test that loading the entry points stays within the import time budget."""
+    # The cumulative times of the modules imported at the top level include those of the modules they import.
+    elapsed = sum(import_times[name][1] for name in ENTRY_POINT_MODULES if import_times.get(name, (None,))[0] == 0)
+    assert 0 < elapsed < IMPORT_TIME_BUDGET, f'importing the plugin took {elapsed:.3f} s'
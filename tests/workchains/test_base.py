@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=no-member
+"""Tests for the :class:`aiida_orca.workchains.OrcaBaseWorkChain` work chain."""
+from aiida.engine import ProcessHandlerReport
+
+from aiida_orca.calculations import OrcaCalculation
+from aiida_orca.workchains import OrcaBaseWorkChain
+
+
+def test_setup(generate_workchain_orca_base):
+    """Test that the orbitals are not retrieved, since failed calculations are restarted from their remote folder."""
+    process = generate_workchain_orca_base()
+
+    assert 'additional_retrieve_list' not in process.ctx.inputs.metadata.options
+
+
+def test_handle_scf_not_converged(generate_workchain_orca_base):
+    """Test that the SCF settings are escalated and that the orbitals of the failed calculation are used."""
+    process = generate_workchain_orca_base(exit_code=OrcaCalculation.exit_codes.ERROR_SCF_NOT_CONVERGED)
+
+    result = process.handle_scf_not_converged(process.ctx.children[-1])
+    assert isinstance(result, ProcessHandlerReport)
+    assert result.do_break
+    assert result.exit_code.status == 0
+
+    parameters = process.ctx.inputs.parameters.get_dict()
+    assert parameters['input_blocks']['scf'] == {
+        'convergence': 'tight',
+        'moinp': '"aiida_old.gbw"',
+        **OrcaBaseWorkChain._SCF_ESCALATION[0],  # pylint: disable=protected-access
+    }
+    # The input keywords of the inputs already have ``MOREAD``
+    assert parameters['extra_input_keywords'] == ['MOREAD']
+    assert process.ctx.inputs.parent_calc_folder.uuid == process.ctx.children[-1].outputs.remote_folder.uuid
+    assert 'file' not in process.ctx.inputs
+
+
+def test_handle_scf_not_converged_abort(generate_workchain_orca_base):
+    """Test that the work chain aborts once the most robust SCF settings were tried."""
+    process = generate_workchain_orca_base(exit_code=OrcaCalculation.exit_codes.ERROR_SCF_NOT_CONVERGED)
+
+    for _ in OrcaBaseWorkChain._SCF_ESCALATION:  # pylint: disable=protected-access
+        result = process.handle_scf_not_converged(process.ctx.children[-1])
+        assert result.exit_code.status == 0
+
+    result = process.handle_scf_not_converged(process.ctx.children[-1])
+    assert result.exit_code == OrcaBaseWorkChain.exit_codes.ERROR_SCF_NOT_CONVERGED
+
+
+def test_handle_out_of_walltime(generate_workchain_orca_base):
+    """Test that a killed optimization continues from its last geometry, Hessian and orbitals, with more walltime."""
+    from aiida.orm import Dict
+
+    positions = [[0.0, 0.0, 0.1], [0.0, 0.8, -0.5], [0.0, -0.8, -0.5]]
+    output_parameters = Dict(dict={'atomcoords': [[[0.0, 0.0, 0.0]] * 3, positions], 'geovalues': [[0.1, 0.2]]})
+    process = generate_workchain_orca_base(
+        exit_code=OrcaCalculation.exit_codes.ERROR_OUT_OF_WALLTIME,
+        retrieved={'aiida.hess': b'hessian'},
+        outputs={'output_parameters': output_parameters},
+        inputs={'walltime_factor': 1.5},
+    )
+
+    result = process.handle_out_of_walltime(process.ctx.children[-1])
+    assert isinstance(result, ProcessHandlerReport)
+    assert result.do_break
+    assert result.exit_code.status == 0
+
+    assert [site.position for site in process.ctx.inputs.structure.sites] == [tuple(p) for p in positions]
+    assert process.ctx.inputs.structure.get_kind_names() == ['O', 'H']
+
+    parameters = process.ctx.inputs.parameters.get_dict()
+    assert parameters['input_blocks']['geom'] == {
+        'maxiter': OrcaBaseWorkChain._OPTIMIZATION_MAX_CYCLES - 1,  # pylint: disable=protected-access
+        'inhess': 'read',
+        'inhessname': '"aiida_old.hess"',
+    }
+    assert parameters['input_blocks']['scf']['moinp'] == '"aiida_old.gbw"'
+    assert process.ctx.inputs.parent_calc_folder.uuid == process.ctx.children[-1].outputs.remote_folder.uuid
+    assert process.ctx.inputs.metadata.options.max_wallclock_seconds == 2700
+
+
+def test_handle_out_of_walltime_no_geometry(generate_workchain_orca_base):
+    """Test that a calculation killed before reaching a geometry is only restarted from its orbitals."""
+    process = generate_workchain_orca_base(exit_code=OrcaCalculation.exit_codes.ERROR_OUT_OF_WALLTIME)
+    structure = process.ctx.inputs.structure
+
+    result = process.handle_out_of_walltime(process.ctx.children[-1])
+    assert result.exit_code.status == 0
+
+    assert process.ctx.inputs.structure is structure
+    assert 'geom' not in process.ctx.inputs.parameters['input_blocks']
+    assert process.ctx.inputs.parameters['input_blocks']['scf']['moinp'] == '"aiida_old.gbw"'
+    assert process.ctx.inputs.metadata.options.max_wallclock_seconds == 1800
+
+
+def test_handle_out_of_walltime_abort(generate_workchain_orca_base):
+    """Test that the work chain aborts when the killed optimization has no cycles left."""
+    from aiida.orm import Dict
+
+    output_parameters = Dict(dict={'atomcoords': [[[0.0, 0.0, 0.0]] * 3], 'geovalues': [[0.1, 0.2]] * 50})
+    process = generate_workchain_orca_base(
+        exit_code=OrcaCalculation.exit_codes.ERROR_OUT_OF_WALLTIME,
+        outputs={'output_parameters': output_parameters},
+    )
+
+    result = process.handle_out_of_walltime(process.ctx.children[-1])
+    assert result.exit_code == OrcaBaseWorkChain.exit_codes.ERROR_OPTIMIZATION_NOT_CONVERGED
+
+
+def test_handle_out_of_walltime_single_point(generate_workchain_orca_base):
+    """Test that a killed single point is only restarted from its orbitals, although its output has a geometry."""
+    from aiida.orm import Dict
+
+    output_parameters = Dict(dict={'atomcoords': [[[0.0, 0.0, 0.1], [0.0, 0.8, -0.5], [0.0, -0.8, -0.5]]]})
+    process = generate_workchain_orca_base(
+        exit_code=OrcaCalculation.exit_codes.ERROR_OUT_OF_WALLTIME,
+        outputs={'output_parameters': output_parameters},
+    )
+    parameters = process.ctx.inputs.parameters.get_dict()
+    parameters['input_keywords'] = ['PBE', 'SV(P)', 'Freq']
+    process.ctx.inputs.parameters = Dict(dict=parameters)
+    structure = process.ctx.inputs.structure
+
+    result = process.handle_out_of_walltime(process.ctx.children[-1])
+    assert result.exit_code.status == 0
+
+    assert process.ctx.inputs.structure is structure
+    assert 'geom' not in process.ctx.inputs.parameters['input_blocks']
+    assert process.ctx.inputs.parameters['input_blocks']['scf']['moinp'] == '"aiida_old.gbw"'
+
+
+def test_handle_out_of_walltime_default_walltime(generate_workchain_orca_base):
+    """Test that the walltime is not scaled when it is left to the scheduler."""
+    process = generate_workchain_orca_base(
+        exit_code=OrcaCalculation.exit_codes.ERROR_OUT_OF_WALLTIME,
+        inputs={'walltime_factor': 1.5},
+    )
+    process.ctx.inputs.metadata.options.pop('max_wallclock_seconds')
+
+    result = process.handle_out_of_walltime(process.ctx.children[-1])
+    assert result.exit_code.status == 0
+
+    assert 'max_wallclock_seconds' not in process.ctx.inputs.metadata.options
+
+
+def test_handle_optimization_not_converged(generate_workchain_orca_base):
+    """Test that an optimization out of cycles continues from its last geometry, Hessian and orbitals."""
+    from aiida.orm import Dict
+
+    positions = [[0.0, 0.0, 0.1], [0.0, 0.8, -0.5], [0.0, -0.8, -0.5]]
+    output_parameters = Dict(dict={'atomcoords': [[[0.0, 0.0, 0.0]] * 3, positions], 'geovalues': [[0.1, 0.2]] * 2})
+    process = generate_workchain_orca_base(
+        exit_code=OrcaCalculation.exit_codes.ERROR_OPTIMIZATION_NOT_CONVERGED,
+        retrieved={'aiida.hess': b'hessian'},
+        outputs={'output_parameters': output_parameters},
+    )
+
+    result = process.handle_optimization_not_converged(process.ctx.children[-1])
+    assert isinstance(result, ProcessHandlerReport)
+    assert result.do_break
+    assert result.exit_code.status == 0
+
+    assert [site.position for site in process.ctx.inputs.structure.sites] == [tuple(p) for p in positions]
+    parameters = process.ctx.inputs.parameters.get_dict()
+    assert parameters['input_blocks']['geom'] == {'inhess': 'read', 'inhessname': '"aiida_old.hess"'}
+    assert parameters['input_blocks']['scf']['moinp'] == '"aiida_old.gbw"'
+    assert process.ctx.inputs.parent_calc_folder.uuid == process.ctx.children[-1].outputs.remote_folder.uuid
+
+
+def test_handle_optimization_not_converged_abort(generate_workchain_orca_base):
+    """Test that the work chain aborts when the optimization out of cycles has no geometry to continue from."""
+    process = generate_workchain_orca_base(exit_code=OrcaCalculation.exit_codes.ERROR_OPTIMIZATION_NOT_CONVERGED)
+
+    result = process.handle_optimization_not_converged(process.ctx.children[-1])
+    assert result.exit_code == OrcaBaseWorkChain.exit_codes.ERROR_OPTIMIZATION_NOT_CONVERGED
+
+
+def test_handle_insufficient_memory(generate_workchain_orca_base):
+    """Test that the work chain aborts when ORCA ran out of memory, rather than rerunning the same inputs."""
+    process = generate_workchain_orca_base(exit_code=OrcaCalculation.exit_codes.ERROR_INSUFFICIENT_MEMORY)
+
+    result = process.handle_insufficient_memory(process.ctx.children[-1])
+    assert result.do_break
+    assert result.exit_code == OrcaBaseWorkChain.exit_codes.ERROR_INSUFFICIENT_MEMORY